@@ -0,0 +1,57 @@
+"""booking_daily_rollup
+
+Revision ID: 5b7e2c91d4a3
+Revises: 0cdff11e907c
+Create Date: 2026-10-17 09:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c91d4a3'
+down_revision: Union[str, Sequence[str], None] = '0cdff11e907c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('booking_daily_rollup',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('court_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('booking_count', sa.Integer(), nullable=False),
+    sa.Column('booked_minutes', sa.Integer(), nullable=False),
+    sa.Column('revenue_minutes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['court_id'], ['courts.id'], ),
+    sa.PrimaryKeyConstraint('date', 'court_id', 'category', 'status')
+    )
+
+    # Backfill from existing bookings (same logic as crud.rebuild_booking_rollup)
+    if op.get_bind().dialect.name == 'sqlite':
+        minutes = "(strftime('%s', end_time) - strftime('%s', start_time)) / 60.0"
+    else:
+        minutes = "EXTRACT(EPOCH FROM (end_time - start_time)) / 60"
+    op.execute(f"""
+        INSERT INTO booking_daily_rollup
+            (date, court_id, category, status, booking_count, booked_minutes, revenue_minutes)
+        SELECT date, court_id,
+               COALESCE(category, 'booking'),
+               COALESCE(status, 'booked'),
+               COUNT(id),
+               CAST(ROUND(SUM({minutes})) AS INTEGER),
+               CAST(ROUND(SUM(CASE WHEN COALESCE(category, 'booking') = 'booking' THEN {minutes} ELSE 0 END)) AS INTEGER)
+        FROM bookings
+        WHERE date IS NOT NULL AND court_id IS NOT NULL
+        GROUP BY date, court_id, COALESCE(category, 'booking'), COALESCE(status, 'booked')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('booking_daily_rollup')
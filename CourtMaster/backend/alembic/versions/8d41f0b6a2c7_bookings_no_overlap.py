@@ -0,0 +1,55 @@
+"""bookings_no_overlap
+
+Revision ID: 8d41f0b6a2c7
+Revises: 5b7e2c91d4a3
+Create Date: 2026-10-17 10:03:55.481920
+
+Existing overlapping bookings must be cleaned up before upgrading,
+otherwise adding the Postgres exclusion constraint fails.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0b6a2c7'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c91d4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite has no exclusion constraints; triggers give the same guarantee
+        # since SQLite serializes writers.
+        for event in ('INSERT', 'UPDATE OF court_id, date, start_time, end_time'):
+            name = 'bookings_no_overlap_' + event.split()[0].lower()
+            self_filter = 'id != NEW.id AND ' if event != 'INSERT' else ''
+            op.execute(f"""
+                CREATE TRIGGER {name} BEFORE {event} ON bookings
+                WHEN EXISTS (
+                    SELECT 1 FROM bookings
+                    WHERE {self_filter}court_id = NEW.court_id AND date = NEW.date
+                      AND start_time < NEW.end_time AND end_time > NEW.start_time
+                )
+                BEGIN SELECT RAISE(ABORT, 'Time slot already booked'); END
+            """)
+    else:
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap EXCLUDE USING gist "
+            "(court_id WITH =, tsrange(date + start_time, date + end_time) WITH &&)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS bookings_no_overlap_insert")
+        op.execute("DROP TRIGGER IF EXISTS bookings_no_overlap_update")
+    else:
+        op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS bookings_no_overlap")
@@ -0,0 +1,111 @@
+"""bookings_monthly_partitions
+
+Revision ID: a4d27c9e13b8
+Revises: f1c86a3b5e04
+Create Date: 2026-10-17 15:21:40.613208
+
+Postgres only: rebuilds `bookings` as a table range-partitioned by month on
+`date` (partitions bookings_pYYYYMM plus a DEFAULT partition bookings_default
+for dates outside them, see app/services/partitions.py). The
+rows are copied, so plan a maintenance window on large databases. Bookings
+without a date must be fixed or removed first. SQLite keeps a plain table.
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d27c9e13b8'
+down_revision: Union[str, Sequence[str], None] = 'f1c86a3b5e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with app/services/partitions.py by hand: migrations don't import app code
+MONTHS_AHEAD = 12
+OVERLAP_EXCLUDE = "EXCLUDE USING gist (court_id WITH =, tsrange(date + start_time, date + end_time) WITH &&)"
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index(op.f('ix_bookings_date'), 'bookings', ['date'], unique=False)
+    op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False)
+    op.create_index('ix_bookings_date_start_time_id', 'bookings', ['date', 'start_time', 'id'], unique=False)
+    op.create_index(
+        'ix_bookings_customer_name_trgm', 'bookings', ['customer_name'],
+        postgresql_using='gin', postgresql_ops={'customer_name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_bookings_mobile_digits_trgm', 'bookings', ['mobile_digits'],
+        postgresql_using='gin', postgresql_ops={'mobile_digits': 'gin_trgm_ops'}
+    )
+    op.create_foreign_key('bookings_court_id_fkey', 'bookings', 'courts', ['court_id'], ['id'])
+
+
+def _swap_table(bind, partitioned: bool) -> None:
+    # Rename the current table away, create the new one with the same columns
+    # and defaults, copy the rows, drop the old table and rebuild indexes on the
+    # new one. The id sequence is detached first so dropping the old table keeps it.
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('bookings', 'id')")).scalar()
+    op.execute("ALTER TABLE bookings RENAME TO bookings_old")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+
+    if partitioned:
+        op.execute("CREATE TABLE bookings (LIKE bookings_old INCLUDING DEFAULTS) PARTITION BY RANGE (date)")
+        first, last = bind.execute(sa.text("SELECT MIN(date), MAX(date) FROM bookings_old")).one()
+        month = (first or date.today()).replace(day=1)
+        horizon = date.today().replace(day=1)
+        for _ in range(MONTHS_AHEAD):
+            horizon = _next_month(horizon)
+        horizon = max(horizon, (last or horizon).replace(day=1))
+        while month <= horizon:
+            name = f"bookings_p{month:%Y%m}"
+            op.execute(
+                f"CREATE TABLE {name} PARTITION OF bookings "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+            )
+            # Exclusion constraints live on the partitions (same-date overlaps only)
+            op.execute(f"ALTER TABLE {name} ADD CONSTRAINT {name}_no_overlap {OVERLAP_EXCLUDE}")
+            month = _next_month(month)
+        # Catches dates no monthly partition covers yet, so inserts never need DDL
+        op.execute("CREATE TABLE bookings_default PARTITION OF bookings DEFAULT")
+        op.execute(f"ALTER TABLE bookings_default ADD CONSTRAINT bookings_default_no_overlap {OVERLAP_EXCLUDE}")
+    else:
+        op.execute("CREATE TABLE bookings (LIKE bookings_old INCLUDING DEFAULTS)")
+
+    op.execute("INSERT INTO bookings SELECT * FROM bookings_old")
+    op.execute("DROP TABLE bookings_old")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY bookings.id")
+
+    # The partition key has to be part of the primary key
+    op.execute("ALTER TABLE bookings ADD PRIMARY KEY (id, date)" if partitioned else "ALTER TABLE bookings ADD PRIMARY KEY (id)")
+    _create_indexes()
+    if not partitioned:
+        op.execute(f"ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap {OVERLAP_EXCLUDE}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        return
+    missing = bind.execute(sa.text("SELECT COUNT(*) FROM bookings WHERE date IS NULL")).scalar()
+    if missing:
+        raise RuntimeError(f"{missing} bookings have no date; fix or delete them before partitioning by date")
+    _swap_table(bind, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        return
+    _swap_table(bind, partitioned=False)
@@ -0,0 +1,28 @@
+"""bookings_keyset_index
+
+Revision ID: c3a9e5d27f18
+Revises: 8d41f0b6a2c7
+Create Date: 2026-10-17 11:20:07.915346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e5d27f18'
+down_revision: Union[str, Sequence[str], None] = '8d41f0b6a2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_date_start_time_id', 'bookings', ['date', 'start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_date_start_time_id', table_name='bookings')
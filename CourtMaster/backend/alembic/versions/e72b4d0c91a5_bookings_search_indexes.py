@@ -0,0 +1,86 @@
+"""bookings_search_indexes
+
+Revision ID: e72b4d0c91a5
+Revises: c3a9e5d27f18
+Create Date: 2026-10-17 12:02:33.640217
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e72b4d0c91a5'
+down_revision: Union[str, Sequence[str], None] = 'c3a9e5d27f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookings', sa.Column('mobile_digits', sa.String(), nullable=True))
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        # No regexp_replace in SQLite: backfill digits from Python
+        rows = bind.execute(sa.text("SELECT id, mobile FROM bookings WHERE mobile IS NOT NULL")).all()
+        if rows:
+            bind.execute(
+                sa.text("UPDATE bookings SET mobile_digits = :digits WHERE id = :id"),
+                [{"id": r.id, "digits": re.sub(r"\D", "", r.mobile)} for r in rows]
+            )
+
+        # Trigram FTS5 index over name + digits, kept in sync by triggers
+        op.execute("""
+            CREATE VIRTUAL TABLE bookings_search USING fts5(
+                customer_name, mobile_digits, content='bookings', content_rowid='id', tokenize='trigram'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER bookings_search_insert AFTER INSERT ON bookings BEGIN
+                INSERT INTO bookings_search(rowid, customer_name, mobile_digits)
+                VALUES (NEW.id, NEW.customer_name, NEW.mobile_digits);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER bookings_search_delete AFTER DELETE ON bookings BEGIN
+                INSERT INTO bookings_search(bookings_search, rowid, customer_name, mobile_digits)
+                VALUES ('delete', OLD.id, OLD.customer_name, OLD.mobile_digits);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER bookings_search_update AFTER UPDATE OF customer_name, mobile_digits ON bookings BEGIN
+                INSERT INTO bookings_search(bookings_search, rowid, customer_name, mobile_digits)
+                VALUES ('delete', OLD.id, OLD.customer_name, OLD.mobile_digits);
+                INSERT INTO bookings_search(rowid, customer_name, mobile_digits)
+                VALUES (NEW.id, NEW.customer_name, NEW.mobile_digits);
+            END
+        """)
+        op.execute("INSERT INTO bookings_search(bookings_search) VALUES ('rebuild')")
+    else:
+        op.execute("UPDATE bookings SET mobile_digits = regexp_replace(mobile, '\\D', '', 'g') WHERE mobile IS NOT NULL")
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_bookings_customer_name_trgm', 'bookings', ['customer_name'],
+            postgresql_using='gin', postgresql_ops={'customer_name': 'gin_trgm_ops'}
+        )
+        op.create_index(
+            'ix_bookings_mobile_digits_trgm', 'bookings', ['mobile_digits'],
+            postgresql_using='gin', postgresql_ops={'mobile_digits': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS bookings_search_update")
+        op.execute("DROP TRIGGER IF EXISTS bookings_search_delete")
+        op.execute("DROP TRIGGER IF EXISTS bookings_search_insert")
+        op.execute("DROP TABLE IF EXISTS bookings_search")
+    else:
+        op.drop_index('ix_bookings_mobile_digits_trgm', table_name='bookings')
+        op.drop_index('ix_bookings_customer_name_trgm', table_name='bookings')
+    op.drop_column('bookings', 'mobile_digits')
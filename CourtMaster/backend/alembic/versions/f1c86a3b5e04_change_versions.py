@@ -0,0 +1,32 @@
+"""change_versions
+
+Revision ID: f1c86a3b5e04
+Revises: e72b4d0c91a5
+Create Date: 2026-10-17 12:48:19.027731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c86a3b5e04'
+down_revision: Union[str, Sequence[str], None] = 'e72b4d0c91a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_versions',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_versions')
@@ -12,6 +12,45 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_ROLE_KEY: str | None = None
     FRONTEND_URL: str = "http://localhost:5173"
+
+    # Connection pools (the sync and async engines each get one of this size).
+    # Pre-ping costs a round trip per checkout; pool recycling alone catches most stale connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_PRE_PING: bool = True
+    # Postgres statement timeouts in ms (0 = none): the default for every session, and the
+    # one for report/dashboard routes so a slow aggregate cannot hold a connection for long
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    REPORT_STATEMENT_TIMEOUT_MS: int = 30000
+
+    # In-process record of slots booked by this process, to reject repeats cheaply (0 entries disables it)
+    OVERLAP_INDEX_SIZE: int = 1024
+    OVERLAP_INDEX_TTL: int = 30
+    # In-process cache of dashboard/report aggregates (0 entries disables it)
+    REPORT_CACHE_SIZE: int = 256
+    REPORT_CACHE_TTL: int = 60
+
+    # Concurrent sections of GET /reports/dashboard (each holds one pooled connection)
+    DASHBOARD_WORKERS: int = 4
+
+    # Background report jobs (POST /reports/jobs); the spool dir defaults to a temp folder
+    REPORT_JOB_DIR: str | None = None
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_MAX_ACTIVE: int = 10
+    REPORT_JOB_RETENTION: int = 86400
+
+    # Where /bookings/bulk-delete writes archives of deleted bookings
+    BULK_DELETE_ARCHIVE_DIR: str = "archives"
+
+    # Postgres monthly booking partitions created ahead of time (after the partitioning migration)
+    BOOKING_PARTITIONS_AHEAD: int = 12
+    # How long creating a partition may wait for its locks before giving up until the next run
+    PARTITION_LOCK_TIMEOUT_MS: int = 2000
+
+    # Largest spreadsheet accepted by POST /bookings/import and scripts/import_bookings.py
+    BOOKING_IMPORT_MAX_ROWS: int = 200000
     
     class Config:
         env_file = ".env"
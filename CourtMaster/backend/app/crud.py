@@ -1,9 +1,24 @@
 from sqlalchemy.orm import Session
-from datetime import date, timedelta, datetime
-from .models import User, Court, Booking, Holiday, Settings
-from .schemas import CreateCourt, CreateBooking, CreateHoliday, CreateSettings
+from sqlalchemy import tuple_, text
+from sqlalchemy.exc import IntegrityError
+from datetime import date, time, timedelta, datetime
+from .models import User, Court, Booking, Holiday, Settings, BookingDailyRollup
+from .models.bookings import OVERLAP_CONSTRAINT, OVERLAP_MESSAGE, normalize_mobile
+from .schemas import CreateCourt, CreateBooking, CreateHoliday, CreateSettings, BookingRecurrence
 from .services.auth import get_password_hash
-from typing import Optional
+from .services.overlap_index import overlap_index
+from .services.report_cache import report_cache, ALL_DATES
+from .services import partitions, versions
+from .services.availability import DEFAULT_OPEN_TIME, DEFAULT_CLOSE_TIME
+from .database import dialect_insert
+from typing import Optional, List
+from bisect import bisect_left, insort
+from itertools import groupby
+import base64
+import csv
+import io
+import json
+import time as time_module
 
 
 def get_user_by_username(db: Session, username: str):
@@ -18,54 +33,380 @@ def create_user(db: Session, username: str, password: str):
     return db_user
 
 # Booking CRUD
-def get_bookings(db: Session, skip: int = 0, limit: int = 100, target_date: date = None, search: str = None):
-    query = db.query(Booking)
-    
+def _filter_bookings(db: Session, query, target_date: date = None, search: str = None):
     if target_date:
         query = query.filter(Booking.date == target_date)
         
     if search:
+        # Case-insensitive substring match on the name, digits-only match on the mobile
+        # ("+91 98765" finds "9198765..."). Both are index-backed: pg_trgm GIN on Postgres,
+        # the bookings_search trigram FTS5 table on SQLite.
         search_term = f"%{search}%"
-        # ILIKE is Postgres specific, but fallback to LIKE for generic if needed. 
-        # Using ilike for case-insensitive match
+        digits = None if any(ch.isalpha() for ch in search) else normalize_mobile(search)
+        if db.get_bind().dialect.name == "sqlite":
+            matches = select(text("rowid")).select_from(text("bookings_search")).where(
+                text("customer_name LIKE :search_term")
+            )
+            if digits:
+                matches = matches.union(
+                    select(text("rowid")).select_from(text("bookings_search")).where(
+                        text("mobile_digits LIKE :digits_term")
+                    )
+                )
+            query = query.filter(Booking.id.in_(matches)).params(
+                search_term=search_term, digits_term=f"%{digits}%"
+            )
+        else:
+            condition = Booking.customer_name.ilike(search_term)
+            if digits:
+                condition = condition | Booking.mobile_digits.like(f"%{digits}%")
+            query = query.filter(condition)
+    return query
+
+# Columns of schemas.Booking, in the same order, for the tuple-based list endpoints
+BOOKING_COLUMNS = (
+    Booking.customer_name, Booking.mobile, Booking.date, Booking.court_id,
+    Booking.start_time, Booking.end_time, Booking.status, Booking.category, Booking.id
+)
+
+def get_booking_rows(db: Session, skip: int = 0, limit: int = 100, target_date: date = None, search: str = None):
+    # Same as get_bookings but returns plain column tuples (no ORM instances)
+    query = _filter_bookings(db, db.query(*BOOKING_COLUMNS), target_date, search)
+    return query.order_by(Booking.start_time).offset(skip).limit(limit).all()
+
+def iter_booking_rows(db: Session, target_date: date = None, search: str = None,
+                      start_date: date = None, end_date: date = None,
+                      court_id: int = None, category: str = None, batch_size: int = 1000):
+    # Uncapped stream of BOOKING_COLUMNS tuples for exports, ordered by (date, start_time, id).
+    # yield_per fetches in batches (server-side cursor on Postgres), so memory stays flat.
+    # start_date/end_date are inclusive.
+    query = _filter_bookings(db, db.query(*BOOKING_COLUMNS), target_date, search)
+    if start_date:
+        query = query.filter(Booking.date >= start_date)
+    if end_date:
+        query = query.filter(Booking.date <= end_date)
+    if court_id is not None:
+        query = query.filter(Booking.court_id == court_id)
+    if category:
+        query = query.filter(Booking.category == category)
+    return query.order_by(Booking.date, Booking.start_time, Booking.id).yield_per(batch_size)
+
+def get_bookings(db: Session, skip: int = 0, limit: int = 100, target_date: date = None, search: str = None):
+    query = _filter_bookings(db, db.query(Booking), target_date, search)
+    return query.order_by(Booking.start_time).offset(skip).limit(limit).all()
+
+def _encode_cursor(booking: Booking) -> str:
+    raw = json.dumps([booking.date.isoformat(), booking.start_time.isoformat(), booking.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, start, booking_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(day), time.fromisoformat(start), int(booking_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def get_bookings_page(db: Session, limit: int = 100, cursor: Optional[str] = None, target_date: date = None, search: str = None):
+    # Keyset pagination ordered by (date, start_time, id), served by ix_bookings_date_start_time_id.
+    # Stable under concurrent inserts, and page N costs the same as page 1.
+    # Returns (rows, next_cursor) with BOOKING_COLUMNS tuples; next_cursor is None on the last page.
+    query = _filter_bookings(db, db.query(*BOOKING_COLUMNS), target_date, search)
+    if cursor:
         query = query.filter(
-            (Booking.customer_name.ilike(search_term)) | 
-            (Booking.mobile.ilike(search_term))
+            tuple_(Booking.date, Booking.start_time, Booking.id) > tuple_(*_decode_cursor(cursor))
         )
-        
-    return query.order_by(Booking.start_time).offset(skip).limit(limit).all()
+    rows = query.order_by(Booking.date, Booking.start_time, Booking.id).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+    return rows, next_cursor
 
 def create_booking(db: Session, booking: CreateBooking):
-    # Overlap check moved here or kept in router? better here for reusability but router has HTTP exceptions.
-    # We will return None or raise error if overlap.
-    
-    # Check for overlap: (StartA < EndB) and (EndA > StartB)
-    overlapping = db.query(Booking).filter(
-        Booking.court_id == booking.court_id,
-        Booking.date == booking.date,
-        Booking.start_time < booking.end_time,
-        Booking.end_time > booking.start_time
-    ).first()
-    
-    if overlapping:
-        print(f"DEBUG: Overlap found! New: {booking.start_time}-{booking.end_time} vs Existing: {overlapping.start_time}-{overlapping.end_time} (ID: {overlapping.id})")
+    # Raises ValueError on an overlap; the router turns it into a 400.
+
+    # Slots this process booked recently are rejected after one EXISTS query instead of a
+    # failed insert; anything else goes straight to the authoritative DB check below.
+    if overlap_index.conflicts(db, booking.court_id, booking.date, booking.start_time, booking.end_time):
         raise ValueError("Time slot already booked")
 
+    # Insert optimistically: the bookings_no_overlap constraint (trigger on SQLite)
+    # is the authoritative check and makes concurrent inserts race-free.
     db_booking = Booking(**booking.dict())
     db.add(db_booking)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        if _is_overlap_violation(e):
+            raise ValueError("Time slot already booked")
+        raise
+    _apply_rollup(db, db_booking, 1)
+    versions.bump(db, versions.booking_date_key(db_booking.date))
     db.commit()
     db.refresh(db_booking)
+    overlap_index.add(db_booking.court_id, db_booking.date, db_booking.start_time, db_booking.end_time)
+    report_cache.invalidate_dates(db_booking.date)
     return db_booking
 
+def _is_overlap_violation(e: IntegrityError) -> bool:
+    # 23P01 = exclusion_violation on Postgres; SQLite trigger aborts with our message
+    return (
+        getattr(e.orig, "pgcode", None) == "23P01"
+        or OVERLAP_CONSTRAINT in str(e.orig)
+        or OVERLAP_MESSAGE in str(e.orig)
+    )
+
+MAX_BATCH_OCCURRENCES = 1000
+
+def expand_recurrence(rule: BookingRecurrence) -> List[CreateBooking]:
+    # Expand a weekly recurrence rule into one booking per matching day (inclusive range)
+    if rule.end_date < rule.start_date:
+        raise ValueError("end_date must be on or after start_date")
+    if any(d < 0 or d > 6 for d in rule.weekdays):
+        raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+
+    weekdays = set(rule.weekdays)
+    template = rule.dict(exclude={"weekdays", "start_date", "end_date"})
+    occurrences = []
+    day = rule.start_date
+    while day <= rule.end_date:
+        if day.weekday() in weekdays:
+            occurrences.append(CreateBooking(date=day, **template))
+            if len(occurrences) > MAX_BATCH_OCCURRENCES:
+                raise ValueError(f"Recurrence expands to more than {MAX_BATCH_OCCURRENCES} bookings")
+        day += timedelta(days=1)
+    return occurrences
+
+def create_bookings_batch(db: Session, bookings: List[CreateBooking], mode: str = "all_or_nothing"):
+    # Validate a whole set of bookings with two set-based queries (holidays, existing
+    # bookings in the date span) and insert the valid ones with one bulk INSERT.
+    # mode: "all_or_nothing" inserts nothing if any occurrence conflicts,
+    #       "best_effort" inserts the valid ones and reports the rest.
+    if mode not in ("all_or_nothing", "best_effort"):
+        raise ValueError("Invalid mode")
+    if not bookings:
+        return [], []
+    if len(bookings) > MAX_BATCH_OCCURRENCES:
+        raise ValueError(f"At most {MAX_BATCH_OCCURRENCES} bookings per batch")
+
+    first_day = min(b.date for b in bookings)
+    last_day = max(b.date for b in bookings)
+    court_ids = {b.court_id for b in bookings}
+
+    holidays = {
+        r.date for r in db.query(Holiday.date).filter(
+            Holiday.date >= first_day,
+            Holiday.date <= last_day
+        )
+    }
+
+    # (court_id, date) -> sorted [(start, end)] of existing bookings
+    taken = {}
+    existing = db.query(Booking.court_id, Booking.date, Booking.start_time, Booking.end_time).filter(
+        Booking.court_id.in_(court_ids),
+        Booking.date >= first_day,
+        Booking.date <= last_day,
+        Booking.start_time.isnot(None),
+        Booking.end_time.isnot(None)
+    )
+    for r in existing:
+        taken.setdefault((r.court_id, r.date), []).append((r.start_time, r.end_time))
+    for intervals in taken.values():
+        intervals.sort()
+
+    accepted, conflicts = [], []
+    for b in bookings:
+        reason = None
+        if b.date in holidays:
+            reason = "Cannot book on a holiday"
+        else:
+            # Same sorted-interval test as the overlap index; also catches clashes within the batch
+            intervals = taken.setdefault((b.court_id, b.date), [])
+            i = bisect_left(intervals, (b.end_time,))
+            if i > 0 and intervals[i - 1][1] > b.start_time:
+                reason = "Time slot already booked"
+            else:
+                insort(intervals, (b.start_time, b.end_time))
+        if reason:
+            conflicts.append({
+                "date": b.date,
+                "court_id": b.court_id,
+                "start_time": b.start_time,
+                "end_time": b.end_time,
+                "reason": reason
+            })
+        else:
+            accepted.append(b)
+
+    if not accepted or (conflicts and mode == "all_or_nothing"):
+        return [], conflicts
+
+    try:
+        created = db.scalars(
+            insert(Booking).returning(Booking),
+            [b.dict() for b in accepted]
+        ).all()
+    except IntegrityError as e:
+        # A concurrent writer took one of the slots after our check
+        db.rollback()
+        if _is_overlap_violation(e):
+            raise ValueError("Time slot already booked")
+        raise
+    _upsert_rollup(db, [_rollup_delta(b) for b in accepted])
+    versions.bump(db, *[versions.booking_date_key(b.date) for b in accepted])
+    db.commit()
+
+    for b in created:
+        overlap_index.add(b.court_id, b.date, b.start_time, b.end_time)
+    report_cache.invalidate_dates(*[b.date for b in created])
+    return created, conflicts
+
+# Columns written by import_bookings (mobile_digits is filled in by the parser: COPY skips Python defaults)
+IMPORT_COLUMNS = ("customer_name", "mobile", "mobile_digits", "date", "court_id", "start_time", "end_time", "status", "category")
+
+def import_bookings(db: Session, rows: list, mode: str = "all_or_nothing", dry_run: bool = False):
+    # Validate and insert parsed spreadsheet rows (services.imports.ImportRow).
+    # Same checks as create_bookings_batch, sized for whole files: one query each for
+    # courts, holidays and existing bookings over the file's date span, then a sorted
+    # sweep per court-day that also catches clashes between rows of the file itself.
+    # Valid rows go in with COPY on Postgres and one executemany INSERT elsewhere.
+    # Returns (imported, errors) with errors as {"row", "reason"}; dry_run only validates.
+    if mode not in ("all_or_nothing", "best_effort"):
+        raise ValueError("Invalid mode")
+    errors = []
+    if not rows:
+        return 0, errors
+
+    courts = {r.id for r in db.query(Court.id)}
+    first_day = min(r.date for r in rows)
+    last_day = max(r.date for r in rows)
+    holidays = {
+        r.date for r in db.query(Holiday.date).filter(
+            Holiday.date >= first_day,
+            Holiday.date <= last_day
+        )
+    }
+    candidates = []
+    for r in rows:
+        if r.court_id not in courts:
+            errors.append({"row": r.row, "reason": f"Court {r.court_id} does not exist"})
+        elif r.date in holidays:
+            errors.append({"row": r.row, "reason": "Cannot book on a holiday"})
+        else:
+            candidates.append(r)
+
+    # (court_id, date) -> sorted [(start, end)] of existing bookings, which never overlap each other
+    taken = {}
+    if candidates:
+        existing = db.query(Booking.court_id, Booking.date, Booking.start_time, Booking.end_time).filter(
+            Booking.court_id.in_({r.court_id for r in candidates}),
+            Booking.date >= first_day,
+            Booking.date <= last_day,
+            Booking.start_time.isnot(None),
+            Booking.end_time.isnot(None)
+        )
+        for r in existing:
+            taken.setdefault((r.court_id, r.date), []).append((r.start_time, r.end_time))
+        for intervals in taken.values():
+            intervals.sort()
+
+    # Sweep each court-day in start order: a row is kept if it misses the existing bookings
+    # and starts after the end of the last kept row (kept rows never overlap, so that is enough)
+    accepted = []
+    candidates.sort(key=lambda r: (r.court_id, r.date, r.start_time, r.row))
+    for key, group in groupby(candidates, key=lambda r: (r.court_id, r.date)):
+        intervals = taken.get(key, ())
+        last = None
+        for r in group:
+            i = bisect_left(intervals, (r.end_time,))
+            if i > 0 and intervals[i - 1][1] > r.start_time:
+                errors.append({"row": r.row, "reason": "Time slot already booked"})
+            elif last is not None and r.start_time < last.end_time:
+                errors.append({"row": r.row, "reason": f"Overlaps row {last.row} of the file"})
+            else:
+                accepted.append(r)
+                last = r
+    errors.sort(key=lambda e: e["row"])
+
+    if dry_run or not accepted or (errors and mode == "all_or_nothing"):
+        return 0, errors
+
+    days = {r.date for r in accepted}
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            _copy_bookings(db, accepted)
+        else:
+            db.execute(Booking.__table__.insert(), [{c: getattr(r, c) for c in IMPORT_COLUMNS} for r in accepted])
+    except IntegrityError as e:
+        # A concurrent writer took one of the slots after our check; nothing was imported
+        db.rollback()
+        if _is_overlap_violation(e):
+            raise ValueError("Time slot already booked")
+        raise
+    _upsert_rollup(db, [_rollup_delta(r) for r in accepted])
+    versions.bump(db, versions.BOOKINGS, *[versions.booking_date_key(d) for d in days])
+    db.commit()
+
+    overlap_index.invalidate_range(min(days), max(days))
+    report_cache.invalidate_range(min(days), max(days))
+    return len(accepted), errors
+
+def _copy_bookings(db: Session, rows: list):
+    # COPY ... FROM STDIN in the session's transaction; constraints still apply per row
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([getattr(r, c) for c in IMPORT_COLUMNS] for r in rows)
+    buffer.seek(0)
+    bind = db.get_bind()
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY bookings ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    except bind.dialect.dbapi.IntegrityError as e:
+        # Raw driver error: wrap it like SQLAlchemy would so callers handle one type
+        raise IntegrityError("COPY bookings", None, e) from e
+    finally:
+        cursor.close()
+
 def delete_booking(db: Session, booking_id: int):
     db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if db_booking:
         db.delete(db_booking)
+        _apply_rollup(db, db_booking, -1)
+        versions.bump(db, versions.booking_date_key(db_booking.date))
         db.commit()
+        overlap_index.invalidate(db_booking.court_id, db_booking.date)
+        report_cache.invalidate_dates(db_booking.date)
     return db_booking
 
 # Dashboard & Reporting CRUD
-from sqlalchemy import func, extract, cast, Date
+from sqlalchemy import func, extract, cast, Date, Time, Integer, case, distinct, select, insert, delete, literal, literal_column, union_all
+
+def _duration_minutes(db: Session, start=Booking.start_time, end=Booking.end_time):
+    # Booking length in minutes as a SQL expression.
+    # Postgres subtracts TIME columns into an INTERVAL, SQLite stores them as 'HH:MM:SS' text.
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.strftime('%s', end) - func.strftime('%s', start)) / 60.0
+    return extract('epoch', end - start) / 60
+
+def _clipped_minutes(db: Session, open_time: time, close_time: time):
+    # Minutes of each booking that fall inside opening hours (0 if entirely outside)
+    open_at = literal(open_time, Time)
+    close_at = literal(close_time, Time)
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite's multi-argument min()/max() are scalar; times compare as text
+        minutes = _duration_minutes(db, func.max(Booking.start_time, open_at), func.min(Booking.end_time, close_at))
+        return func.max(minutes, 0)
+    minutes = _duration_minutes(db, func.greatest(Booking.start_time, open_at), func.least(Booking.end_time, close_at))
+    return func.greatest(minutes, 0)
+
+def _price_per_hour():
+    # Settings.price_per_hour as a scalar subquery, 400 when unset
+    return func.coalesce(
+        select(Settings.price_per_hour).order_by(Settings.id).limit(1).scalar_subquery(),
+        400
+    )
 
 def get_dashboard_stats(db: Session, period: str = "overall"):
     # 1. Determine date range
@@ -83,109 +424,151 @@ def get_dashboard_stats(db: Session, period: str = "overall"):
         start_date = date(today.year, 1, 1)
     else:
         start_date = None # Overall
-        
-    # 2. Build Query - Use ILIKE for case insensitive match on status
-    # Note: SQLite (if used) might need func.lower() but Postgres supports ILIKE
-    # For safety in hybrid envs without knowing exact DB:
-    display_status = func.lower(Booking.status)
-    query = db.query(Booking).filter(display_status.in_(["confirmed", "booked"]))
+
+    # Keyed by the resolved start date: "month" is the same entry all month long
+    return report_cache.get_or_load(
+        ("dashboard_stats", start_date), (start_date, None),
+        lambda: _dashboard_stats(db, start_date)
+    )
+
+def _dashboard_stats(db: Session, start_date: Optional[date]):
+    # 2. Pricing from Settings (single row), folded into the aggregate as a scalar subquery
+    price_per_hour = _price_per_hour()
+
+    # 3. Single aggregate query
+    # Revenue rule: (duration_minutes / 60) * price_per_hour, only for category='booking'
+    revenue_minutes = func.coalesce(
+        func.sum(case((Booking.category == 'booking', _duration_minutes(db)), else_=0)),
+        0
+    )
+    # Status match is case insensitive via lower() so it works on both Postgres and SQLite
+    query = db.query(
+        func.count(Booking.id).label("total_bookings"),
+        (revenue_minutes * price_per_hour / 60).label("revenue"),
+        func.count(distinct(Booking.customer_name)).label("active_customers")
+    ).filter(func.lower(Booking.status).in_(["confirmed", "booked"]))
     
     if start_date:
         query = query.filter(Booking.date >= start_date)
         
-    bookings = query.all()
-    
-    # 3. Aggregations
-    total_bookings = len(bookings)
-
-    # 4. Get Pricing from Settings
-    settings = db.query(Settings).first()
-    price_per_hour = settings.price_per_hour if settings else 400
-    
-    # 5. Revenue Calculation
-    # Rule: (duration_minutes / 60) * price_per_hour
-    # CRITICAL: Only count bookings with category='booking'
-    total_revenue = 0.0
-    for b in bookings:
-        # Check category (handle None as 'booking' for backward compat if DB update missed active session objects, though script ran)
-        cat = getattr(b, 'category', 'booking')
-        print(f"DEBUG: ID={b.id}, Category={cat}, Status={b.status}")
-        if cat != 'booking':
-            continue
-        
-        # Calculate duration in minutes
-        # start_time and end_time are datetime.time objects
-        start_dt = datetime.combine(date.min, b.start_time)
-        end_dt = datetime.combine(date.min, b.end_time)
-        diff = end_dt - start_dt
-        duration_minutes = diff.total_seconds() / 60
-        
-        # Pricing
-        res = (duration_minutes / 60) * price_per_hour
-        total_revenue += res
-
-    # Active Customers (unique in this period)
-    active_customers = len(set([b.customer_name for b in bookings]))
+    stats = query.one()
 
     return {
-        "total_bookings": total_bookings,
-        "revenue": round(total_revenue),
-        "active_customers": active_customers
+        "total_bookings": stats.total_bookings,
+        "revenue": round(stats.revenue or 0),
+        "active_customers": stats.active_customers
     }
 
 def get_daily_bookings_chart(db: Session, days: int = 30):
-    # Group by date for last N days (simplified to all for now or modify query)
+    # Group by date from N days ago (today included) onwards; future bookings stay in the
+    # chart as they always have. Open-ended range on the rollup key.
+    start_date = date.today() - timedelta(days=days - 1)
+    return report_cache.get_or_load(
+        ("daily_chart", start_date), (start_date, None),
+        lambda: _daily_bookings_chart(db, start_date)
+    )
+
+def _daily_bookings_chart(db: Session, start_date: date):
     results = db.query(
-        Booking.date, 
-        func.count(Booking.id).label("count")
-    ).group_by(Booking.date).order_by(Booking.date).all()
+        BookingDailyRollup.date,
+        func.sum(BookingDailyRollup.booking_count).label("count")
+    ).filter(
+        BookingDailyRollup.date >= start_date
+    ).group_by(BookingDailyRollup.date).order_by(BookingDailyRollup.date).all()
     
     return [{"date": r.date, "count": r.count} for r in results]
 
 def get_booking_status_distribution(db: Session):
+    return report_cache.get_or_load(
+        ("status_distribution",), ALL_DATES,
+        lambda: _booking_status_distribution(db)
+    )
+
+def _booking_status_distribution(db: Session):
     results = db.query(
-        Booking.status,
-        func.count(Booking.id).label("count")
-    ).group_by(Booking.status).all()
+        BookingDailyRollup.status,
+        func.sum(BookingDailyRollup.booking_count).label("count")
+    ).group_by(BookingDailyRollup.status).all()
     return [{"name": r.status, "value": r.count} for r in results]
 
 def get_court_capacity_heatmap(db: Session, start_date: date, end_date: date):
-    # Return count of bookings per court per day
+    # Booked minutes and utilization per court per day (inclusive range), zero-filled for
+    # every active court and day. Booking time is clipped to Settings opening hours in SQL
+    # and aggregated with a single GROUP BY over the date-indexed range.
+    return report_cache.get_or_load(
+        ("capacity_heatmap", start_date, end_date), (start_date, end_date),
+        lambda: _court_capacity_heatmap(db, start_date, end_date)
+    )
+
+def _court_capacity_heatmap(db: Session, start_date: date, end_date: date):
+    settings = db.query(Settings).first()
+    open_time = settings.open_time if settings and settings.open_time else DEFAULT_OPEN_TIME
+    close_time = settings.close_time if settings and settings.close_time else DEFAULT_CLOSE_TIME
+    open_minutes = max(_booking_minutes(open_time, close_time), 0)
+
     results = db.query(
         Booking.date,
         Booking.court_id,
-        func.count(Booking.id).label("booked_hours")
+        func.sum(_clipped_minutes(db, open_time, close_time)).label("booked_minutes")
     ).filter(
         Booking.date >= start_date,
         Booking.date <= end_date
     ).group_by(Booking.date, Booking.court_id).all()
-    
-    return [
-        {"date": r.date, "court_id": r.court_id, "booked_hours": r.booked_hours}
-        for r in results
-    ]
+    booked = {(r.date, r.court_id): int(round(r.booked_minutes or 0)) for r in results}
 
-def get_monthly_calendar(db: Session, year: int, month: int):
-    # Extract month and year
-    results = db.query(
-        Booking.date,
-        func.count(Booking.id).label("count")
+    holidays = {
+        r.date for r in db.query(Holiday.date).filter(
+            Holiday.date >= start_date,
+            Holiday.date <= end_date
+        )
+    }
+    court_ids = {c.id for c in db.query(Court.id).filter(Court.active.isnot(False))}
+    court_ids.update(court_id for _, court_id in booked)
+
+    heatmap = []
+    day = start_date
+    while day <= end_date:
+        for court_id in sorted(court_ids):
+            minutes = booked.get((day, court_id), 0)
+            heatmap.append({
+                "date": day,
+                "court_id": court_id,
+                "booked_minutes": minutes,
+                "booked_hours": round(minutes / 60, 2),
+                "open_minutes": open_minutes,
+                "utilization": round(100 * minutes / open_minutes, 1) if open_minutes else 0.0,
+                "holiday": day in holidays
+            })
+        day += timedelta(days=1)
+    return heatmap
+
+def _month_range(year: int, month: int):
+    # Half-open [first day, first day of next month); range predicates can use the date index
+    start_date = date(year, month, 1)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start_date, end_date
+
+def get_monthly_calendar(db: Session, year: int, month: int, court_id: Optional[int] = None):
+    start_date, end_date = _month_range(year, month)
+    query = db.query(
+        BookingDailyRollup.date,
+        func.sum(BookingDailyRollup.booking_count).label("count")
     ).filter(
-        extract('year', Booking.date) == year,
-        extract('month', Booking.date) == month
-    ).group_by(Booking.date).all()
-    
-    # Also fetch details for tooltip/modal? For now just summary
-    # Or fetch all bookings for that month to let frontend process?
-    # Requirement says "returning summarized data: { date, count, bookings: [] }"
-    
-    # Let's fetch all bookings for the month and restructure in router or here.
-    # Actually, simpler to just fetch all bookings for range and let Router/Frontend group them.
-    # But for "Month View Aggregation", let's return the simplified list.
+        BookingDailyRollup.date >= start_date,
+        BookingDailyRollup.date < end_date
+    )
+    if court_id is not None:
+        query = query.filter(BookingDailyRollup.court_id == court_id)
+    results = query.group_by(BookingDailyRollup.date).order_by(BookingDailyRollup.date).all()
     
     return [{"date": r.date, "count": r.count} for r in results]
 
-def bulk_delete_bookings(db: Session, period: str, year: Optional[int] = None, month: Optional[int] = None, week: Optional[int] = None):
+# Bulk delete batching: rows per transaction and pause between batches (seconds)
+BULK_DELETE_BATCH = 5000
+BULK_DELETE_PAUSE = 0.05
+
+def bulk_delete_range(period: str, year: Optional[int] = None, month: Optional[int] = None, week: Optional[int] = None):
+    # Inclusive (start_date, end_date) of a bulk delete period, None if the week is out of range
     start_date = None
     end_date = None
     
@@ -204,7 +587,7 @@ def bulk_delete_bookings(db: Session, period: str, year: Optional[int] = None, m
         last_day_of_month = next_month - timedelta(days=1)
         
         if start_date > last_day_of_month:
-            return 0 # Week out of range for month
+            return None # Week out of range for month
             
         if end_date > last_day_of_month:
             end_date = last_day_of_month
@@ -226,21 +609,300 @@ def bulk_delete_bookings(db: Session, period: str, year: Optional[int] = None, m
     else:
         raise ValueError("Invalid period")
 
-    query = db.query(Booking).filter(Booking.date >= start_date, Booking.date <= end_date)
-    
-    count = query.count()
-    if count == 0:
+    return start_date, end_date
+
+def iter_bulk_delete(db: Session, start_date: date, end_date: date, batch_size: int = BULK_DELETE_BATCH,
+                     pause: float = BULK_DELETE_PAUSE, archive=None):
+    # Delete the bookings of an inclusive date range in primary-key batches, each in its own
+    # short transaction so live booking writes are never blocked for long. Yields
+    # (deleted, total) after every committed batch. With `archive` (exports.BookingArchive)
+    # each batch's rows are written out before its delete commits.
+    in_range = (Booking.date >= start_date, Booking.date <= end_date)
+    total = db.query(func.count(Booking.id)).filter(*in_range).scalar()
+    months = partitions.whole_months(db, start_date, end_date)
+    if total and months is not None:
+        yield from _truncate_month_partitions(db, months, total, archive)
+        return
+    deleted = 0
+    last_id = 0
+    while total:
+        # Upper PK bound of the next batch (index-only lookup)
+        ids = db.query(Booking.id).filter(*in_range, Booking.id > last_id).order_by(Booking.id).limit(batch_size).all()
+        if not ids:
+            break
+        first_id, last_id = last_id, ids[-1].id
+        rows = db.execute(
+            delete(Booking).where(*in_range, Booking.id > first_id, Booking.id <= last_id).returning(*BOOKING_COLUMNS),
+            execution_options={"synchronize_session": False}
+        ).all()
+        if not rows:
+            db.rollback()
+            continue
+        if archive is not None:
+            archive.write(rows)
+
+        # Keep the rollup exact batch by batch instead of dropping it at the end
+        _upsert_rollup(db, [_rollup_delta(r, -1) for r in rows])
+        batch_start = min(r.date for r in rows)
+        batch_end = max(r.date for r in rows)
+        db.query(BookingDailyRollup).filter(
+            BookingDailyRollup.date >= batch_start,
+            BookingDailyRollup.date <= batch_end,
+            BookingDailyRollup.booking_count <= 0
+        ).delete(synchronize_session=False)
+        versions.bump(db, versions.BOOKINGS)
+        db.commit()
+        overlap_index.invalidate_range(batch_start, batch_end)
+        report_cache.invalidate_range(batch_start, batch_end)
+
+        deleted += len(rows)
+        yield deleted, max(total, deleted)
+        if len(ids) == batch_size and pause:
+            time_module.sleep(pause)
+
+def _truncate_month_partitions(db: Session, months, total: int, archive=None):
+    # Fast path of iter_bulk_delete on a partitioned Postgres table: empty each month's
+    # partition with TRUNCATE (no per-row delete, WAL or vacuum). The partition itself is
+    # kept so the partition set never shrinks under other workers' inserts. EXCLUSIVE mode
+    # blocks writes to that month while it is counted and archived, so both match exactly
+    # what gets truncated, but reads go on; only the TRUNCATE itself takes ACCESS
+    # EXCLUSIVE, for the moment it needs to swap in the empty file before the commit.
+    deleted = 0
+    for month in months:
+        month_end = partitions.next_month(month) - timedelta(days=1)
+        db.execute(text(f"LOCK TABLE {partitions.partition_name(month)} IN EXCLUSIVE MODE"))
+        if archive is not None:
+            result = db.execute(
+                select(*BOOKING_COLUMNS).where(Booking.date >= month, Booking.date <= month_end).order_by(Booking.id),
+                execution_options={"yield_per": BULK_DELETE_BATCH}
+            )
+            count = 0
+            for batch in result.partitions():
+                archive.write(batch)
+                count += len(batch)
+        else:
+            count = db.query(func.count(Booking.id)).filter(Booking.date >= month, Booking.date <= month_end).scalar()
+        if not count:
+            db.rollback()
+            continue
+
+        db.execute(text(f"TRUNCATE TABLE {partitions.partition_name(month)}"))
+        db.query(BookingDailyRollup).filter(
+            BookingDailyRollup.date >= month,
+            BookingDailyRollup.date <= month_end
+        ).delete(synchronize_session=False)
+        versions.bump(db, versions.BOOKINGS)
+        db.commit()
+        overlap_index.invalidate_range(month, month_end)
+        report_cache.invalidate_range(month, month_end)
+
+        deleted += count
+        yield deleted, max(total, deleted)
+
+def bulk_delete_bookings(db: Session, period: str, year: Optional[int] = None, month: Optional[int] = None,
+                         week: Optional[int] = None, batch_size: int = BULK_DELETE_BATCH,
+                         pause: float = BULK_DELETE_PAUSE, archive=None, progress=None):
+    # Batched delete of a week/month/year; `progress(deleted, total)` after each batch.
+    # Returns the number of deleted bookings.
+    date_range = bulk_delete_range(period, year=year, month=month, week=week)
+    if date_range is None:
         return 0
-        
-    query.delete(synchronize_session=False)
-    db.commit()
-    return count
+    deleted = 0
+    for deleted, total in iter_bulk_delete(db, *date_range, batch_size=batch_size, pause=pause, archive=archive):
+        if progress:
+            progress(deleted, total)
+    return deleted
+
+# Levels of the revenue pivot, keyed by which of (court, category, month) are rolled up
+REVENUE_LEVELS = {
+    (False, False, False): "detail",
+    (False, False, True): "court_category",
+    (False, True, True): "court",
+    (True, True, False): "month",
+    (True, True, True): "total",
+}
+
+def get_revenue_pivot(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    # Revenue, hours and booking count by court x category x month, with subtotals per
+    # court/category, court and month plus a grand total. Same rules as the dashboard:
+    # confirmed/booked only, revenue for category 'booking' at Settings.price_per_hour.
+    return report_cache.get_or_load(
+        ("revenue_pivot", start_date, end_date), (start_date, end_date),
+        lambda: _revenue_pivot(db, start_date, end_date)
+    )
+
+def _revenue_pivot(db: Session, start_date: Optional[date], end_date: Optional[date]):
+    rollup = BookingDailyRollup
+    if db.get_bind().dialect.name == "sqlite":
+        month = func.strftime('%Y-%m', rollup.date)
+    else:
+        # Literal format (not a bind) so SELECT and GROUP BY see the same expression
+        month = func.to_char(rollup.date, literal_column("'YYYY-MM'"))
+    price_per_hour = _price_per_hour()
+    measures = [
+        func.sum(rollup.booking_count).label("booking_count"),
+        func.sum(rollup.booked_minutes).label("booked_minutes"),
+        (func.sum(rollup.revenue_minutes) * price_per_hour / 60.0).label("revenue"),
+    ]
+    filters = [func.lower(rollup.status).in_(["confirmed", "booked"])]
+    if start_date:
+        filters.append(rollup.date >= start_date)
+    if end_date:
+        filters.append(rollup.date <= end_date)
+
+    if db.get_bind().dialect.name == "sqlite":
+        # No GROUPING SETS on SQLite: one SELECT per level, NULL for rolled-up columns
+        dims = {"court_id": rollup.court_id, "category": rollup.category, "month": month}
+        parts = []
+        for rolled_up in REVENUE_LEVELS:
+            kept = [expr for expr, up in zip(dims.values(), rolled_up) if not up]
+            parts.append(select(
+                *[literal(None).label(name) if up else expr.label(name) for (name, expr), up in zip(dims.items(), rolled_up)],
+                *[literal(up).label(f"{name}_total") for name, up in zip(dims, rolled_up)],
+                *measures
+            ).where(*filters).group_by(*kept))
+        query = union_all(*parts)
+    else:
+        query = select(
+            rollup.court_id.label("court_id"),
+            rollup.category.label("category"),
+            month.label("month"),
+            (func.grouping(rollup.court_id) == 1).label("court_id_total"),
+            (func.grouping(rollup.category) == 1).label("category_total"),
+            (func.grouping(month) == 1).label("month_total"),
+            *measures
+        ).where(*filters).group_by(func.grouping_sets(
+            tuple_(rollup.court_id, rollup.category, month),
+            tuple_(rollup.court_id, rollup.category),
+            tuple_(rollup.court_id),
+            tuple_(month),
+            tuple_()
+        ))
+
+    rows = []
+    for r in db.execute(query):
+        if r.booking_count is None:
+            continue  # grand total over an empty range
+        rows.append({
+            "level": REVENUE_LEVELS[(bool(r.court_id_total), bool(r.category_total), bool(r.month_total))],
+            "court_id": r.court_id,
+            "category": r.category,
+            "month": r.month,
+            "booking_count": int(r.booking_count),
+            "hours": round((r.booked_minutes or 0) / 60, 2),
+            "revenue": round(r.revenue or 0),
+        })
+    # Detail rows first, then subtotals, each ordered by court, category, month
+    order = list(REVENUE_LEVELS.values())
+    rows.sort(key=lambda r: (order.index(r["level"]), r["court_id"] or 0, r["category"] or "", r["month"] or ""))
+    return rows
 
 def get_booking_years(db: Session):
-    # Fetch distinct years from the bookings table
-    results = db.query(extract('year', Booking.date).label('year')).distinct().all()
+    # Span of years from MIN/MAX(date): two ix_bookings_date lookups instead of a full scan.
+    # Kept as separate queries: SQLite only applies its min/max index shortcut to a lone aggregate.
+    first = db.query(func.min(Booking.date)).scalar()
+    last = db.query(func.max(Booking.date)).scalar()
     # If no bookings, at least return current year
-    years = sorted([int(r.year) for r in results], reverse=True)
-    if not years:
-        years = [date.today().year]
-    return years
+    if not first:
+        return [date.today().year]
+    return list(range(last.year, first.year - 1, -1))
+
+# Daily rollup maintenance
+def _booking_minutes(start_time, end_time) -> int:
+    start_dt = datetime.combine(date.min, start_time)
+    end_dt = datetime.combine(date.min, end_time)
+    return int((end_dt - start_dt).total_seconds() // 60)
+
+def _rollup_delta(booking, sign: int = 1) -> dict:
+    # One booking's contribution to its booking_daily_rollup row
+    category = booking.category or "booking"
+    minutes = _booking_minutes(booking.start_time, booking.end_time)
+    return {
+        "date": booking.date,
+        "court_id": booking.court_id,
+        "category": category,
+        "status": booking.status or "booked",
+        "booking_count": sign,
+        "booked_minutes": sign * minutes,
+        "revenue_minutes": sign * minutes if category == "booking" else 0,
+    }
+
+def _upsert_rollup(db: Session, deltas: list):
+    # Add a list of deltas to booking_daily_rollup with one (executemany) upsert.
+    # Runs inside the caller's transaction; the caller commits.
+    # Deltas are merged per key first: Postgres rejects a multi-row ON CONFLICT
+    # statement that touches the same row twice.
+    merged = {}
+    for d in deltas:
+        key = (d["date"], d["court_id"], d["category"], d["status"])
+        if key in merged:
+            for field in ("booking_count", "booked_minutes", "revenue_minutes"):
+                merged[key][field] += d[field]
+        else:
+            merged[key] = dict(d)
+    if not merged:
+        return
+    stmt = dialect_insert(db)(BookingDailyRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "court_id", "category", "status"],
+        set_={
+            "booking_count": BookingDailyRollup.booking_count + stmt.excluded.booking_count,
+            "booked_minutes": BookingDailyRollup.booked_minutes + stmt.excluded.booked_minutes,
+            "revenue_minutes": BookingDailyRollup.revenue_minutes + stmt.excluded.revenue_minutes,
+        }
+    )
+    db.execute(stmt, list(merged.values()))
+
+def _apply_rollup(db: Session, booking: Booking, sign: int):
+    # Add (sign=1) or remove (sign=-1) one booking from booking_daily_rollup.
+    delta = _rollup_delta(booking, sign)
+    _upsert_rollup(db, [delta])
+
+    if sign < 0:
+        db.query(BookingDailyRollup).filter(
+            BookingDailyRollup.date == delta["date"],
+            BookingDailyRollup.court_id == delta["court_id"],
+            BookingDailyRollup.category == delta["category"],
+            BookingDailyRollup.status == delta["status"],
+            BookingDailyRollup.booking_count <= 0
+        ).delete(synchronize_session=False)
+
+def rebuild_booking_rollup(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    # Recompute booking_daily_rollup from the raw bookings table (backfill / repair).
+    # Optional inclusive date bounds limit the rebuild to part of the history.
+    rollup_query = db.query(BookingDailyRollup)
+    if start_date:
+        rollup_query = rollup_query.filter(BookingDailyRollup.date >= start_date)
+    if end_date:
+        rollup_query = rollup_query.filter(BookingDailyRollup.date <= end_date)
+    rollup_query.delete(synchronize_session=False)
+
+    category = func.coalesce(Booking.category, "booking")
+    status = func.coalesce(Booking.status, "booked")
+    minutes = _duration_minutes(db)
+    source = select(
+        Booking.date,
+        Booking.court_id,
+        category,
+        status,
+        func.count(Booking.id),
+        cast(func.round(func.sum(minutes)), Integer),
+        cast(func.round(func.sum(case((category == "booking", minutes), else_=0))), Integer)
+    ).where(
+        Booking.date.isnot(None),
+        Booking.court_id.isnot(None)
+    ).group_by(Booking.date, Booking.court_id, category, status)
+    if start_date:
+        source = source.where(Booking.date >= start_date)
+    if end_date:
+        source = source.where(Booking.date <= end_date)
+
+    result = db.execute(
+        insert(BookingDailyRollup).from_select(
+            ["date", "court_id", "category", "status", "booking_count", "booked_minutes", "revenue_minutes"],
+            source
+        )
+    )
+    db.commit()
+    report_cache.clear()
+    return result.rowcount
@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import get_settings
+from .services import pool_metrics
 
 settings = get_settings()
 
@@ -9,20 +13,101 @@ settings = get_settings()
 # But assuming DATABASE_URL in .env is correct from previous steps.
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+# Pool settings shared by the sync and async engines (each has its own pool of this size)
+POOL_OPTIONS = dict(
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT
+)
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=5,
-    max_overflow=10
+    poolclass=pool_metrics.TimedQueuePool,
+    **POOL_OPTIONS
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async driver for the same database URL: asyncpg for Postgres, aiosqlite for SQLite
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url(url: str):
+    # (url, connect_args) for create_async_engine
+    url = make_url(url)
+    connect_args = {}
+    if "sslmode" in url.query:
+        # asyncpg takes ssl= instead of libpq's sslmode=
+        connect_args["ssl"] = url.query["sslmode"]
+        url = url.difference_update_query(["sslmode"])
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]), connect_args
+
+ASYNC_DATABASE_URL, ASYNC_CONNECT_ARGS = async_database_url(SQLALCHEMY_DATABASE_URL)
+
+# Used by the async routes (bookings list/create, availability, dashboard, login).
+# The sync engine stays for everything else.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=ASYNC_CONNECT_ARGS,
+    poolclass=pool_metrics.TimedAsyncQueuePool,
+    **POOL_OPTIONS
+)
+# expire_on_commit=False: attributes must not lazy-load once the response is being built
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# GET /metrics/pool
+pool_metrics.register("sync", engine)
+pool_metrics.register("async", async_engine.sync_engine)
+
 Base = declarative_base()
 
+# Statement timeouts (Postgres). A session's info["statement_timeout"] (ms, 0 = none) is
+# applied with SET LOCAL to each transaction it begins, so it never leaks into the pool.
+STATEMENT_TIMEOUT = "statement_timeout"
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    timeout = session.info.get(STATEMENT_TIMEOUT, settings.DB_STATEMENT_TIMEOUT_MS)
+    if timeout and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+def is_statement_timeout(e: OperationalError) -> bool:
+    # 57014 = query_canceled (psycopg2 pgcode / asyncpg sqlstate)
+    orig = e.orig
+    return "57014" in (getattr(orig, "pgcode", None), getattr(orig, "sqlstate", None)) or "statement timeout" in str(orig)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    # Sync crud helpers run on it through `await db.run_sync(fn, ...)`
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_db_with_timeout(timeout_ms: int):
+    # get_db whose statements are cancelled after timeout_ms (Postgres), e.g. for reports
+    def dependency():
+        db = SessionLocal(info={STATEMENT_TIMEOUT: timeout_ms})
+        try:
+            yield db
+        finally:
+            db.close()
+    return dependency
+
+def get_async_db_with_timeout(timeout_ms: int):
+    async def dependency():
+        async with AsyncSessionLocal(info={STATEMENT_TIMEOUT: timeout_ms}) as db:
+            yield db
+    return dependency
+
+def dialect_insert(db):
+    # INSERT construct with ON CONFLICT support for the session's backend (Postgres or SQLite)
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
@@ -1,13 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from .routers import auth, bookings, reports, courts, settings as settings_router
-from .database import SessionLocal
+from .routers import auth, bookings, reports, courts, holidays, metrics, settings as settings_router
+from .database import SessionLocal, async_engine, is_statement_timeout
 from .models.user import User
 from .services.auth import get_password_hash
+from .services import partitions, report_jobs
 
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -40,16 +43,36 @@ async def lifespan(app: FastAPI):
                 print(f"Migration failed: {e}")
                 db.rollback()
 
+        # 3. Monthly booking partitions ahead of time (Postgres, once migrated); also run
+        # scripts/ensure_partitions.py daily so long-running servers never run out
+        created, skipped = partitions.ensure_future_partitions(db)
+        if skipped:
+            print(f"Booking partitions not created (lock timeout or rows in the default partition): "
+                  f"{', '.join(partitions.partition_name(m) for m in skipped)}")
+
     except Exception as e:
         print(f"Error initializing database: {e}")
     finally:
         db.close()
-    
+
+    # Report jobs left queued/running by the previous process are marked failed
+    report_jobs.list_jobs()
+
     yield
-    # Shutdown logic if needed
+    # Shutdown: stop the report job pool (queued jobs are dropped, running ones finish)
+    report_jobs.shutdown()
+    await async_engine.dispose()
 
 app = FastAPI(title="Venue Manager API", lifespan=lifespan)
 
+@app.exception_handler(OperationalError)
+async def statement_timeout_handler(request: Request, exc: OperationalError):
+    # Queries cancelled by a statement timeout (see database.get_db_with_timeout) are a 503,
+    # anything else stays an unhandled error
+    if is_statement_timeout(exc):
+        return JSONResponse(status_code=503, content={"detail": "Query timed out, try a smaller date range"})
+    raise exc
+
 import os
 
 # Cors Root Fix
@@ -82,6 +105,8 @@ app.include_router(bookings.router, prefix="/bookings", tags=["bookings"])
 app.include_router(reports.router, prefix="/reports", tags=["reports"])
 app.include_router(courts.router, prefix="/courts", tags=["courts"])
 app.include_router(settings_router.router, prefix="/settings", tags=["settings"])
+app.include_router(holidays.router)  # prefix="/holidays" is set on the router itself
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 @app.get("/")
 def health_check():
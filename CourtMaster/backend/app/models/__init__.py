@@ -4,4 +4,5 @@ from .holidays import Holiday
 from .bookings import Booking
 from .user import User
 from .admin_users import AdminUser
-
+from .booking_rollups import BookingDailyRollup
+from .change_versions import ChangeVersion
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from ..database import Base
+
+class BookingDailyRollup(Base):
+    # Pre-aggregated bookings per (date, court, category, status).
+    # Kept in sync by the booking write paths in crud.py so reports never scan `bookings`.
+    __tablename__ = "booking_daily_rollup"
+    
+    date = Column(Date, primary_key=True)
+    court_id = Column(Integer, ForeignKey("courts.id"), primary_key=True)
+    category = Column(String, primary_key=True, default="booking")
+    status = Column(String, primary_key=True, default="booked")
+    booking_count = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0)
+    revenue_minutes = Column(Integer, nullable=False, default=0)
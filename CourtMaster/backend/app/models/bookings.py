@@ -1,5 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Index, DDL, event
 from ..database import Base
+import re
+
+def normalize_mobile(mobile):
+    # Digits only, so "+91 98765-43210" is searchable as "9876543210"
+    return re.sub(r"\D", "", mobile) if mobile else None
+
+def _mobile_digits_default(context):
+    return normalize_mobile(context.get_current_parameters().get("mobile"))
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -7,9 +15,85 @@ class Booking(Base):
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String)
     mobile = Column(String, nullable=True)
+    mobile_digits = Column(String, nullable=True, default=_mobile_digits_default)
     date = Column(Date, index=True)
     court_id = Column(Integer, ForeignKey("courts.id"))
     start_time = Column(Time)
     end_time = Column(Time)
     status = Column(String, default="booked")
     category = Column(String, default="booking")
+
+    __table_args__ = (
+        # Keyset pagination order for GET /bookings/ (crud.get_bookings_page)
+        Index("ix_bookings_date_start_time_id", "date", "start_time", "id"),
+        # Substring search (crud._filter_bookings); SQLite uses the bookings_search FTS5 table instead
+        Index(
+            "ix_bookings_customer_name_trgm", "customer_name",
+            postgresql_using="gin", postgresql_ops={"customer_name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_bookings_mobile_digits_trgm", "mobile_digits",
+            postgresql_using="gin", postgresql_ops={"mobile_digits": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+# No-overlap guarantee enforced by the database itself (see alembic revision 8d41f0b6a2c7).
+# Postgres: exclusion constraint on (court_id, [date+start, date+end)).
+# SQLite: triggers that abort with the same message crud.create_booking reports.
+OVERLAP_CONSTRAINT = "bookings_no_overlap"
+OVERLAP_MESSAGE = "Time slot already booked"
+
+PG_OVERLAP_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    f"ALTER TABLE bookings ADD CONSTRAINT {OVERLAP_CONSTRAINT} EXCLUDE USING gist "
+    "(court_id WITH =, tsrange(date + start_time, date + end_time) WITH &&)",
+]
+
+SQLITE_OVERLAP_DDL = [
+    f"""CREATE TRIGGER {OVERLAP_CONSTRAINT}_insert BEFORE INSERT ON bookings
+    WHEN EXISTS (
+        SELECT 1 FROM bookings
+        WHERE court_id = NEW.court_id AND date = NEW.date
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    )
+    BEGIN SELECT RAISE(ABORT, '{OVERLAP_MESSAGE}'); END""",
+    f"""CREATE TRIGGER {OVERLAP_CONSTRAINT}_update BEFORE UPDATE OF court_id, date, start_time, end_time ON bookings
+    WHEN EXISTS (
+        SELECT 1 FROM bookings
+        WHERE id != NEW.id AND court_id = NEW.court_id AND date = NEW.date
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    )
+    BEGIN SELECT RAISE(ABORT, '{OVERLAP_MESSAGE}'); END""",
+]
+
+# Also install them on databases built with Base.metadata.create_all (e.g. SQLite test DBs)
+for statement in PG_OVERLAP_DDL:
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_OVERLAP_DDL:
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# Substring search support (see alembic revision e72b4d0c91a5).
+# Postgres: pg_trgm GIN indexes above. SQLite: trigram FTS5 table kept in sync by triggers.
+SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE bookings_search USING fts5(
+        customer_name, mobile_digits, content='bookings', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER bookings_search_insert AFTER INSERT ON bookings BEGIN
+        INSERT INTO bookings_search(rowid, customer_name, mobile_digits)
+        VALUES (NEW.id, NEW.customer_name, NEW.mobile_digits);
+    END""",
+    """CREATE TRIGGER bookings_search_delete AFTER DELETE ON bookings BEGIN
+        INSERT INTO bookings_search(bookings_search, rowid, customer_name, mobile_digits)
+        VALUES ('delete', OLD.id, OLD.customer_name, OLD.mobile_digits);
+    END""",
+    """CREATE TRIGGER bookings_search_update AFTER UPDATE OF customer_name, mobile_digits ON bookings BEGIN
+        INSERT INTO bookings_search(bookings_search, rowid, customer_name, mobile_digits)
+        VALUES ('delete', OLD.id, OLD.customer_name, OLD.mobile_digits);
+        INSERT INTO bookings_search(rowid, customer_name, mobile_digits)
+        VALUES (NEW.id, NEW.customer_name, NEW.mobile_digits);
+    END""",
+]
+
+event.listen(Booking.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+class ChangeVersion(Base):
+    # Monotonic change counters used for ETags, e.g. "bookings:2026-01-31", "courts", "settings".
+    # Bumped in the same transaction as the write they describe.
+    __tablename__ = "change_versions"
+    
+    key = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,29 @@
+from decimal import Decimal
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj):
+    # orjson handles date/time/datetime natively; SQL aggregates may come back as Decimal
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Return it directly from an endpoint with plain dicts/lists (e.g. from
+    rows_to_dicts) to skip jsonable_encoder and response_model validation.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def rows_to_dicts(rows, keys=None):
+    # Column rows (tuples from db.query(col, ...)) -> list of dicts, no ORM objects involved
+    if not rows:
+        return []
+    keys = keys or rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from ..database import get_db
+from ..database import get_async_db
 from ..models.user import User
 from ..services.auth import verify_password, create_access_token
 from ..schemas.auth import Token
@@ -12,17 +14,17 @@ router = APIRouter()
 import traceback
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     try:
         print(f"DEBUG: Login attempt for user: {form_data.username}")
         # Find user by username
-        user = db.query(User).filter(User.username == form_data.username).first()
+        user = await db.scalar(select(User).where(User.username == form_data.username).limit(1))
         
         if not user:
             print("DEBUG: User not found in database")
         
-        # Authenticate
-        if not user or not verify_password(form_data.password, user.password_hash):
+        # Authenticate (bcrypt is deliberately slow: keep it off the event loop)
+        if not user or not await run_in_threadpool(verify_password, form_data.password, user.password_hash):
             print("DEBUG: Password verification failed")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
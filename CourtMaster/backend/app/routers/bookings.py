@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
+import os
+import orjson
 from .. import models, schemas, crud
-from ..database import get_db
+from ..config import get_settings
+from ..database import get_db, get_async_db, SessionLocal
+from ..services import availability, exports, imports, versions
+from ..responses import FastJSONResponse, rows_to_dicts
+
+settings = get_settings()
 
 router = APIRouter(
     tags=["bookings"],
@@ -16,38 +26,125 @@ def read_calendar_view(
     court_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    # Reuse crud logic or custom query
-    # If filtering by court_id, we need a filtered versions of aggregation
-    # For now, let's use the simple one and assume court_id logic can be added if needed
-    
-    # Determine full day range for month? 
-    # Use crud.get_monthly_calendar logic
-    return crud.get_monthly_calendar(db, year, month)
+    # Per-day booking counts for the month, optionally for a single court
+    return FastJSONResponse(crud.get_monthly_calendar(db, year, month, court_id=court_id))
+
+@router.get("/availability")
+async def read_availability(
+    date: date,
+    days: int = 1,
+    court_id: Optional[int] = None,
+    duration: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Free slots per court per day; duration in minutes (defaults to one slot)
+    try:
+        return await db.run_sync(availability.get_availability, date, days=days, court_id=court_id, duration=duration)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/next-available")
+async def read_next_available(
+    duration: int,
+    after: Optional[datetime] = None,
+    limit: int = 5,
+    horizon_days: int = 60,
+    court_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # e.g. "next free 90-minute slot on any court after 6pm": duration=90&after=2026-01-10T18:00
+    try:
+        return await db.run_sync(
+            availability.find_next_available,
+            after or datetime.now(),
+            duration,
+            limit=limit,
+            horizon_days=horizon_days,
+            court_id=court_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=List[schemas.Booking])
-def read_bookings(
+async def read_bookings(
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     date: Optional[date] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Use 'date' query param as requested in prompt, mapped to target_date in crud
-    bookings = crud.get_bookings(db, skip=skip, limit=limit, target_date=date, search=search)
-    return bookings
+    if date:
+        # Day schedules are polled constantly: answer 304 from the change counters alone
+        etag = await db.run_sync(versions.etag, request, versions.booking_date_key(date), versions.BOOKINGS)
+        cached = versions.not_modified(request, response, etag)
+        if cached:
+            return cached
+
+    if cursor is not None:
+        # Keyset mode: pass cursor= (empty) for the first page, then the X-Next-Cursor header value
+        try:
+            bookings, next_cursor = await db.run_sync(
+                crud.get_bookings_page, limit=limit, cursor=cursor, target_date=date, search=search
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return FastJSONResponse(rows_to_dicts(bookings), headers=dict(response.headers))
+
+    # Column tuples encoded straight to JSON (same shape as schemas.Booking)
+    bookings = await db.run_sync(crud.get_booking_rows, skip=skip, limit=limit, target_date=date, search=search)
+    return FastJSONResponse(rows_to_dicts(bookings), headers=dict(response.headers))
 
 @router.post("/", response_model=schemas.Booking)
-def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db)):
+async def create_booking(booking: schemas.BookingCreate, db: AsyncSession = Depends(get_async_db)):
     # Check for holiday
-    holiday = db.query(models.Holiday).filter(models.Holiday.date == booking.date).first()
+    holiday = await db.scalar(select(models.Holiday.id).where(models.Holiday.date == booking.date).limit(1))
     if holiday:
         raise HTTPException(status_code=400, detail="Cannot book on a holiday")
 
     try:
-        return crud.create_booking(db=db, booking=booking)
+        return await db.run_sync(crud.create_booking, booking)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/batch", response_model=schemas.BookingBatchResult)
+def create_bookings_batch(batch: schemas.BookingBatchCreate, db: Session = Depends(get_db)):
+    # Explicit list or recurrence rule, validated and inserted in one transaction
+    if bool(batch.bookings) == bool(batch.recurrence):
+        raise HTTPException(status_code=400, detail="Provide either 'bookings' or 'recurrence'")
+
+    try:
+        if batch.recurrence:
+            occurrences = crud.expand_recurrence(batch.recurrence)
+        else:
+            occurrences = batch.bookings
+        created, conflicts = crud.create_bookings_batch(db, occurrences, mode=batch.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"created": created, "conflicts": conflicts}
+
+@router.post("/import", response_model=schemas.BookingImportResult)
+def import_bookings(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    mode: str = Form("all_or_nothing"),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db)
+):
+    # Spreadsheet upload (xlsx or csv, from the extension unless format is given).
+    # Same modes as /batch; the report lists every failed row by sheet row number.
+    try:
+        format = imports.import_format(file.filename, format)
+        result = imports.import_bookings(db, file.file, format, mode=mode, dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(result)
+
 @router.delete("/{booking_id}", response_model=schemas.Booking)
 def delete_booking(booking_id: int, db: Session = Depends(get_db)):
     db_booking = crud.delete_booking(db, booking_id)
@@ -55,25 +152,65 @@ def delete_booking(booking_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Booking not found")
     return db_booking
 
+def _archive_path(start_date: date, end_date: date, format: str) -> str:
+    os.makedirs(settings.BULK_DELETE_ARCHIVE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    name = f"bookings_{start_date}_{end_date}_{stamp}.{exports.ARCHIVE_FORMATS[format]}"
+    return os.path.join(settings.BULK_DELETE_ARCHIVE_DIR, name)
+
+def _bulk_delete_events(db: Session, date_range, archive):
+    # {"deleted", "total"} after each committed batch, then the final result
+    deleted = 0
+    try:
+        if date_range:
+            for deleted, total in crud.iter_bulk_delete(db, *date_range, archive=archive):
+                yield {"deleted": deleted, "total": total}
+    finally:
+        if archive is not None:
+            archive.close()
+            if deleted == 0:
+                archive.remove()
+    if deleted == 0:
+        yield {"message": "No booking data found for selected period.", "count": 0, "archive": None}
+    else:
+        yield {
+            "message": "Selected booking data deleted successfully",
+            "count": deleted,
+            "archive": archive.path if archive is not None else None
+        }
+
+def _streamed_bulk_delete(date_range, archive):
+    # Runs after the endpoint has returned, so it owns its DB session
+    db = SessionLocal()
+    try:
+        for event in _bulk_delete_events(db, date_range, archive):
+            yield orjson.dumps(event) + b"\n"
+    finally:
+        db.close()
+
 @router.post("/bulk-delete")
 def delete_bookings_bulk(
     params: schemas.BulkDeleteParams,
     db: Session = Depends(get_db)
 ):
+    # Deletes in committed primary-key batches (crud.iter_bulk_delete), optionally archiving
+    # the deleted rows first (archive: ndjson | parquet). With stream_progress the response
+    # is NDJSON progress lines ending with the usual {"message", "count", "archive"} object.
     try:
-        count = crud.bulk_delete_bookings(
-            db, 
-            params.period, 
-            year=params.year, 
-            month=params.month, 
-            week=params.week
-        )
-        if count == 0:
-            return {"message": "No booking data found for selected period.", "count": 0}
-        return {"message": "Selected booking data deleted successfully", "count": count}
+        date_range = crud.bulk_delete_range(params.period, year=params.year, month=params.month, week=params.week)
+        archive = None
+        if params.archive and date_range:
+            if params.archive not in exports.ARCHIVE_FORMATS:
+                raise ValueError(f"archive must be one of: {', '.join(exports.ARCHIVE_FORMATS)}")
+            archive = exports.BookingArchive(_archive_path(*date_range, params.archive), params.archive)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    if params.stream_progress:
+        return StreamingResponse(_streamed_bulk_delete(date_range, archive), media_type="application/x-ndjson")
+    *_, result = _bulk_delete_events(db, date_range, archive)
+    return result
+
 @router.get("/years", response_model=List[int])
 def get_years(db: Session = Depends(get_db)):
     return crud.get_booking_years(db)
@@ -1,33 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas
 from ..database import get_db
+from ..services import versions
+from ..services.report_cache import report_cache
+from ..responses import FastJSONResponse, rows_to_dicts
 
 router = APIRouter(
     tags=["courts"],
 )
 
 @router.get("/", response_model=List[schemas.Court])
-def read_courts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    # Map DB 'active' to Schema 'is_active'
-    # We can do this manually or let Pydantic handle it if mapped.
-    # The Schema has from_attributes=True.
-    # But field names differ: db.active vs schema.is_active.
-    # We can alias it in the query or just construct the list.
-    courts = db.query(models.Court).offset(skip).limit(limit).all()
-    # Manual mapping to ensure correctness
-    return [
-        schemas.Court(id=c.id, name=c.name, is_active=c.active)
-        for c in courts
-    ]
+def read_courts(request: Request, response: Response, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    etag = versions.etag(db, request, versions.COURTS)
+    cached = versions.not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    # Map DB 'active' to Schema 'is_active' with a column label,
+    # then encode the tuples directly (same shape as schemas.Court)
+    courts = db.query(
+        models.Court.id,
+        models.Court.name,
+        models.Court.active.label("is_active")
+    ).offset(skip).limit(limit).all()
+    return FastJSONResponse(rows_to_dicts(courts), headers=dict(response.headers))
 
 @router.post("/", response_model=schemas.Court)
 def create_court(court: schemas.CreateCourt, db: Session = Depends(get_db)):
     # Map Schema 'is_active' to DB 'active'
     db_court = models.Court(name=court.name, active=court.is_active)
     db.add(db_court)
+    versions.bump(db, versions.COURTS)
     db.commit()
+    report_cache.clear()
     db.refresh(db_court)
     # Map back
     return schemas.Court(id=db_court.id, name=db_court.name, is_active=db_court.active)
@@ -40,8 +47,10 @@ def update_court(court_id: int, court: schemas.CreateCourt, db: Session = Depend
     
     db_court.name = court.name
     db_court.active = court.is_active
+    versions.bump(db, versions.COURTS)
     
     db.commit()
+    report_cache.clear()
     db.refresh(db_court)
     return schemas.Court(id=db_court.id, name=db_court.name, is_active=db_court.active)
 
@@ -52,5 +61,7 @@ def delete_court(court_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Court not found")
     
     db.delete(db_court)
+    versions.bump(db, versions.COURTS)
     db.commit()
+    report_cache.clear()
     return {"ok": True}
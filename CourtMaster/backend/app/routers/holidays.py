@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas
 from ..database import get_db
+from ..responses import FastJSONResponse, rows_to_dicts
+from ..services.report_cache import report_cache
 
 router = APIRouter(
     prefix="/holidays",
@@ -11,8 +13,8 @@ router = APIRouter(
 
 @router.get("/", response_model=List[schemas.Holiday])
 def read_holidays(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    holidays = db.query(models.Holiday).offset(skip).limit(limit).all()
-    return holidays
+    holidays = db.query(models.Holiday.date, models.Holiday.id).offset(skip).limit(limit).all()
+    return FastJSONResponse(rows_to_dicts(holidays))
 
 @router.post("/", response_model=schemas.Holiday)
 def create_holiday(holiday: schemas.HolidayCreate, db: Session = Depends(get_db)):
@@ -20,6 +22,8 @@ def create_holiday(holiday: schemas.HolidayCreate, db: Session = Depends(get_db)
     db.add(db_holiday)
     db.commit()
     db.refresh(db_holiday)
+    # Capacity figures covering this date count it as closed now
+    report_cache.invalidate_dates(db_holiday.date)
     return db_holiday
 
 @router.delete("/{holiday_id}")
@@ -29,4 +33,5 @@ def delete_holiday(holiday_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Holiday not found")
     db.delete(db_holiday)
     db.commit()
+    report_cache.invalidate_dates(db_holiday.date)
     return {"ok": True}
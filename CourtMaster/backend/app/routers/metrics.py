@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from ..services import pool_metrics
+from ..services.overlap_index import overlap_index
+from ..services.report_cache import report_cache
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+@router.get("/overlap-index")
+def overlap_index_stats():
+    # Hit/miss counters of the in-memory booking overlap pre-check
+    return overlap_index.stats()
+
+@router.get("/cache")
+def report_cache_stats():
+    # Hit ratio and size of the dashboard/report aggregate cache
+    return report_cache.stats()
+
+@router.get("/pool")
+def connection_pool_stats():
+    # Live checked-out/overflow levels plus checkout, wait and hold-time histograms per engine
+    return pool_metrics.stats()
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from fastapi.responses import StreamingResponse
-from typing import Optional
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import List, Optional
 from datetime import date
-from io import BytesIO
-import openpyxl
-from openpyxl.styles import Font, PatternFill
+import asyncio
+import tempfile
+import time
 
-from ..database import get_db
-from .. import models, crud
+from ..config import get_settings
+from ..database import get_db, get_db_with_timeout
+from .. import models, crud, schemas
+from ..responses import FastJSONResponse
+from ..services import exports
+from ..services import dashboard as dashboard_service
+from ..services import report_jobs
+from ..services import occupancy
+
+settings = get_settings()
+
+# Aggregate routes run with REPORT_STATEMENT_TIMEOUT_MS so they cannot hog pooled connections
+get_report_db = get_db_with_timeout(settings.REPORT_STATEMENT_TIMEOUT_MS)
 
 router = APIRouter(
     tags=["reports"],
@@ -18,86 +29,155 @@ router = APIRouter(
 def export_bookings(
     date: Optional[date] = None,
     search: Optional[str] = None,
+    format: str = "xlsx",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    court_id: Optional[int] = None,
+    category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    # Reuse existing filter logic
-    bookings = crud.get_bookings(db, skip=0, limit=10000, target_date=date, search=search)
-    
-    # Create Excel Workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Bookings Report"
-    
-    # Headers
-    headers = ["ID", "Customer Name", "Mobile", "Date", "Start Time", "End Time", "Court ID", "Status", "Category"]
-    ws.append(headers)
-    
-    # Style Headers
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid") # Indigo Primary
-    
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        
-    # Data
-    for booking in bookings:
-        ws.append([
-            booking.id,
-            booking.customer_name,
-            booking.mobile,
-            booking.date,
-            booking.start_time,
-            booking.end_time,
-            booking.court_id,
-            booking.status,
-            getattr(booking, "category", "booking")
-        ])
-        
-    # Auto-adjust column width (approximate)
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2)
-        ws.column_dimensions[column].width = adjusted_width
-
-    # Save to buffer
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    
-    filename = f"bookings_export_{date if date else 'all'}.xlsx"
-    
+    # Same filters as the bookings list plus an inclusive date range, court and category; no row cap.
+    # format: xlsx (default), csv, ndjson or parquet (needs pyarrow)
+    if format not in exports.MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be one of: xlsx, csv, ndjson, parquet")
+    filters = dict(
+        target_date=date, search=search, start_date=start_date,
+        end_date=end_date, court_id=court_id, category=category
+    )
+    filename = f"bookings_export_{date if date else 'all'}.{format}"
     headers = {
         'Content-Disposition': f'attachment; filename="{filename}"'
     }
+
+    # Row formats stream straight from the DB cursor, batch by batch
+    if format == "csv":
+        body = exports.iter_bookings_csv(**filters)
+    elif format == "ndjson":
+        body = exports.iter_bookings_ndjson(**filters)
+    else:
+        # File formats spool to a temp file (not RAM) and are streamed back in chunks
+        writer = exports.write_bookings_xlsx if format == "xlsx" else exports.write_bookings_parquet
+        buffer = tempfile.TemporaryFile()
+        try:
+            writer(db, buffer, **filters)
+        except ValueError as e:
+            buffer.close()
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception:
+            buffer.close()
+            raise
+        body = exports.iter_file(buffer)
     
     return StreamingResponse(
-        buffer, 
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", 
+        body, 
+        media_type=exports.MEDIA_TYPES[format], 
         headers=headers
     )
 
+def _job_response(request: Request, meta: dict) -> schemas.ReportJob:
+    job = schemas.ReportJob(**meta)
+    if meta["status"] == "done":
+        job.download_url = str(request.url_for("download_report_job", job_id=meta["id"]))
+    return job
+
+@router.post("/jobs", response_model=schemas.ReportJob, status_code=status.HTTP_202_ACCEPTED)
+def create_report_job(job: schemas.ReportJobCreate, request: Request):
+    # Large exports run in a background process pool instead of holding this request;
+    # poll GET /reports/jobs/{id} and fetch download_url once status is "done".
+    params = job.dict()
+    try:
+        meta = report_jobs.submit_job(params.pop("kind"), params.pop("format"), **params)
+    except report_jobs.JobLimitError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _job_response(request, meta)
+
+@router.get("/jobs", response_model=List[schemas.ReportJob])
+def list_report_jobs(request: Request):
+    return [_job_response(request, meta) for meta in report_jobs.list_jobs()]
+
+@router.get("/jobs/{job_id}", response_model=schemas.ReportJob)
+def get_report_job(job_id: str, request: Request):
+    meta = report_jobs.get_job(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(request, meta)
+
+@router.get("/jobs/{job_id}/download", name="download_report_job")
+def download_report_job(job_id: str):
+    meta = report_jobs.get_job(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    path = report_jobs.output_path(meta)
+    if path is None:
+        raise HTTPException(status_code=409, detail=f"Job is {meta['status']}")
+    return FileResponse(path, media_type=report_jobs.MEDIA_TYPES[meta["format"]], filename=meta["filename"])
+
+@router.delete("/jobs/{job_id}", response_model=schemas.ReportJob)
+def cancel_report_job(job_id: str, request: Request):
+    # Cancels a queued/running job, or deletes a finished job and its file
+    meta = report_jobs.cancel_job(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(request, meta)
+
+@router.get("/dashboard")
+async def dashboard(period: str = "overall", days: int = 30):
+    # Everything the dashboard page shows (stats and charts) in one call, queried concurrently.
+    # Per-section durations are reported in the Server-Timing header.
+    started = time.perf_counter()
+    payload, timings = await dashboard_service.build_dashboard(period=period, days=days)
+    total_ms = (time.perf_counter() - started) * 1000
+    return FastJSONResponse(
+        payload,
+        headers={"Server-Timing": dashboard_service.server_timing(timings, total_ms)}
+    )
+
 @router.get("/dashboard/stats")
-def dashboard_stats(period: str = "overall", db: Session = Depends(get_db)):
-    return crud.get_dashboard_stats(db, period=period)
+async def dashboard_stats(period: str = "overall"):
+    # Shares in-flight loads with /dashboard and concurrent calls (dashboard.run_section)
+    stats, _ = await dashboard_service.run_section(*dashboard_service.stats_section(period))
+    return FastJSONResponse(stats)
 
 @router.get("/dashboard/charts")
-def dashboard_charts(db: Session = Depends(get_db)):
-    daily = crud.get_daily_bookings_chart(db)
-    status_dist = crud.get_booking_status_distribution(db)
-    return {"daily": daily, "status": status_dist}
+async def dashboard_charts(days: int = 30):
+    (daily, _), (status_dist, _) = await asyncio.gather(
+        dashboard_service.run_section(*dashboard_service.daily_section(days)),
+        dashboard_service.run_section(*dashboard_service.status_section()),
+    )
+    return FastJSONResponse({"daily": daily, "status": status_dist})
 
 @router.get("/capacity")
 def capacity_heatmap(
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_report_db)
+):
+    return FastJSONResponse(crud.get_court_capacity_heatmap(db, start_date, end_date))
+
+@router.get("/occupancy")
+def occupancy_matrix(
+    start_date: date,
+    end_date: date,
+    court_id: Optional[int] = None,
+    db: Session = Depends(get_report_db)
+):
+    # Courts x weekday x hour-of-day booked minutes, booked fraction and revenue
+    try:
+        return FastJSONResponse(occupancy.get_occupancy_matrix(db, start_date, end_date, court_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/revenue")
+def revenue_pivot(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_report_db)
 ):
-    return crud.get_court_capacity_heatmap(db, start_date, end_date)
+    # Court x category x month revenue/hours/count rows plus subtotal and total rows ("level")
+    return FastJSONResponse({
+        "start_date": start_date,
+        "end_date": end_date,
+        "rows": crud.get_revenue_pivot(db, start_date, end_date)
+    })
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas
 from ..database import get_db
+from ..services import versions
+from ..services.report_cache import report_cache
 
 router = APIRouter(
     tags=["settings"],
@@ -10,8 +12,13 @@ router = APIRouter(
 
 @router.get("/", response_model=schemas.Settings)
 @router.get("", include_in_schema=False)
-def read_settings(db: Session = Depends(get_db)):
+def read_settings(request: Request, response: Response, db: Session = Depends(get_db)):
     from datetime import time
+    etag = versions.etag(db, request, versions.SETTINGS)
+    cached = versions.not_modified(request, response, etag)
+    if cached:
+        return cached
+
     settings = db.query(models.Settings).first()
     if not settings:
         return schemas.Settings(
@@ -36,7 +43,9 @@ def save_settings(settings: schemas.SettingsCreate, db: Session = Depends(get_db
         # Create new ehioh
         db_settings = models.Settings(**settings.dict())
         db.add(db_settings)
+    versions.bump(db, versions.SETTINGS)
     
     db.commit()
+    report_cache.clear()
     db.refresh(db_settings)
     return db_settings
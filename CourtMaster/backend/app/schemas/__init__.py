@@ -1,4 +1,5 @@
 from .court import CreateCourt, Court
-from .bookings import Booking, BookingCreate, CreateBooking, BulkDeleteParams
+from .bookings import Booking, BookingCreate, CreateBooking, BulkDeleteParams, BookingRecurrence, BookingBatchCreate, BookingConflict, BookingBatchResult, BookingImportError, BookingImportResult
 from .holidays import Holiday, HolidayCreate, CreateHoliday
 from .settings import Settings, SettingsCreate, CreateSettings
+from .report_jobs import ReportJobCreate, ReportJob
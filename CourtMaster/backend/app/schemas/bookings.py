@@ -1,7 +1,24 @@
 from datetime import date, time
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel, validator
 
+# Validators shared by every schema with start_time/end_time fields
+
+def _parse_time(cls, v):
+    if isinstance(v, str):
+        # If string length is 5 (HH:MM), append :00
+        if len(v) == 5:
+            v = v + ":00"
+        return time.fromisoformat(v)
+    return v
+
+def _end_after_start(cls, v, values):
+    # Bookings cannot run past midnight: an "00:00" end would be before the start
+    start = values.get('start_time')
+    if start is not None and v <= start:
+        raise ValueError('end_time must be after start_time')
+    return v
+
 class BookingBase(BaseModel):
     customer_name: str
     mobile: Optional[str] = None
@@ -13,14 +30,8 @@ class BookingBase(BaseModel):
     category: Optional[str] = "booking"
 
 class BookingCreate(BookingBase):
-    @validator('start_time', 'end_time', pre=True)
-    def parse_time(cls, v):
-        if isinstance(v, str):
-            # If string length is 5 (HH:MM), append :00
-            if len(v) == 5:
-                v = v + ":00"
-            return time.fromisoformat(v)
-        return v
+    parse_time = validator('start_time', 'end_time', pre=True, allow_reuse=True)(_parse_time)
+    end_after_start = validator('end_time', allow_reuse=True)(_end_after_start)
 
 CreateBooking = BookingCreate
 
@@ -35,3 +46,48 @@ class BulkDeleteParams(BaseModel):
     year: Optional[int] = None
     month: Optional[int] = None
     week: Optional[int] = None
+    archive: Optional[str] = None  # "ndjson" (gzip) or "parquet": keep a copy of the deleted rows
+    stream_progress: bool = False  # respond with NDJSON progress lines instead of one JSON object
+
+class BookingRecurrence(BaseModel):
+    # Weekly rule, e.g. every Tuesday and Thursday (weekdays=[1, 3]) for a term
+    customer_name: str
+    mobile: Optional[str] = None
+    court_id: int
+    weekdays: List[int]  # 0 = Monday ... 6 = Sunday
+    start_date: date
+    end_date: date
+    start_time: time
+    end_time: time
+    status: Optional[str] = "booked"
+    category: Optional[str] = "booking"
+
+    parse_time = validator('start_time', 'end_time', pre=True, allow_reuse=True)(_parse_time)
+    end_after_start = validator('end_time', allow_reuse=True)(_end_after_start)
+
+class BookingBatchCreate(BaseModel):
+    # Either an explicit list or a recurrence rule
+    bookings: Optional[List[BookingCreate]] = None
+    recurrence: Optional[BookingRecurrence] = None
+    mode: str = "all_or_nothing"  # or "best_effort"
+
+class BookingConflict(BaseModel):
+    date: date
+    court_id: int
+    start_time: time
+    end_time: time
+    reason: str
+
+class BookingBatchResult(BaseModel):
+    created: List[Booking]
+    conflicts: List[BookingConflict]
+
+class BookingImportError(BaseModel):
+    row: int  # line in the uploaded sheet, the header being row 1
+    reason: str
+
+class BookingImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[BookingImportError]
@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from typing import Optional
+from pydantic import BaseModel, validator
+
+JOB_KINDS = ("export", "capacity")
+EXPORT_FORMATS = ("xlsx", "csv", "ndjson", "parquet")
+
+class ReportJobCreate(BaseModel):
+    # export: bookings export in `format` with the /reports/bookings/export filters
+    # capacity: capacity heatmap for start_date..end_date as JSON
+    kind: str = "export"
+    format: str = "xlsx"
+    target_date: Optional[date] = None
+    search: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    court_id: Optional[int] = None
+    category: Optional[str] = None
+
+    @validator('kind')
+    def check_kind(cls, v):
+        if v not in JOB_KINDS:
+            raise ValueError(f"kind must be one of: {', '.join(JOB_KINDS)}")
+        return v
+
+    @validator('format')
+    def check_format(cls, v):
+        if v not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        return v
+
+class ReportJob(BaseModel):
+    id: str
+    kind: str
+    format: str
+    status: str  # queued, running, done, failed, cancelled
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows: Optional[int] = None
+    size: Optional[int] = None
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
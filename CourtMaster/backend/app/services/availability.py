@@ -0,0 +1,234 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import Booking, Court, Holiday, Settings
+
+# Same fallbacks as GET /settings when no settings row exists
+DEFAULT_OPEN_TIME = time(5, 0)
+DEFAULT_CLOSE_TIME = time(12, 0)
+DEFAULT_SLOT_DURATION = 60
+MAX_AVAILABILITY_DAYS = 62
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def _format_minutes(m: int) -> str:
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+def get_opening_hours(db: Session):
+    # (open_minute, close_minute, slot_minutes) from the settings row
+    settings = db.query(Settings).first()
+    open_time = settings.open_time if settings and settings.open_time else DEFAULT_OPEN_TIME
+    close_time = settings.close_time if settings and settings.close_time else DEFAULT_CLOSE_TIME
+    slot = settings.slot_duration if settings and settings.slot_duration else DEFAULT_SLOT_DURATION
+    return _minutes(open_time), _minutes(close_time), slot
+
+
+def busy_grid(db: Session, start_date: date, days: int, court_ids: list, open_min: int, close_min: int, slot: int):
+    """Boolean occupancy grid of shape (days, courts, slots).
+
+    Slot j covers [open + j*slot, open + (j+1)*slot). A slot is busy if any
+    booking overlaps it; holidays mark the whole day busy. Built from one
+    bookings query and one holidays query.
+    """
+    n_slots = max((close_min - open_min) // slot, 0)
+    end_date = start_date + timedelta(days=days - 1)
+    grid = np.zeros((days, len(court_ids), n_slots), dtype=bool)
+    if n_slots == 0 or not court_ids:
+        return grid, np.zeros(days, dtype=bool)
+
+    rows = db.query(Booking.date, Booking.court_id, Booking.start_time, Booking.end_time).filter(
+        Booking.court_id.in_(court_ids),
+        Booking.date >= start_date,
+        Booking.date <= end_date,
+        Booking.start_time.isnot(None),
+        Booking.end_time.isnot(None)
+    ).all()
+
+    if rows:
+        court_pos = {cid: i for i, cid in enumerate(court_ids)}
+        day_idx = np.fromiter(((r.date - start_date).days for r in rows), dtype=np.int64, count=len(rows))
+        court_idx = np.fromiter((court_pos[r.court_id] for r in rows), dtype=np.int64, count=len(rows))
+        starts = np.fromiter((_minutes(r.start_time) for r in rows), dtype=np.int64, count=len(rows))
+        ends = np.fromiter((_minutes(r.end_time) for r in rows), dtype=np.int64, count=len(rows))
+
+        # First and one-past-last slot each booking touches, clipped to opening hours
+        first = np.clip((starts - open_min) // slot, 0, n_slots)
+        last = np.clip(-((open_min - ends) // slot), 0, n_slots)  # ceil division
+        keep = last > first
+
+        # Difference array + cumsum marks every slot in [first, last) per booking
+        diff = np.zeros((days, len(court_ids), n_slots + 1), dtype=np.int32)
+        np.add.at(diff, (day_idx[keep], court_idx[keep], first[keep]), 1)
+        np.add.at(diff, (day_idx[keep], court_idx[keep], last[keep]), -1)
+        grid = np.cumsum(diff, axis=2)[:, :, :n_slots] > 0
+
+    holidays = {
+        r.date for r in db.query(Holiday.date).filter(
+            Holiday.date >= start_date,
+            Holiday.date <= end_date
+        )
+    }
+    holiday_mask = np.array(
+        [start_date + timedelta(days=d) in holidays for d in range(days)], dtype=bool
+    )
+    grid[holiday_mask] = True
+    return grid, holiday_mask
+
+
+def free_starts(grid: np.ndarray, slots_needed: int) -> np.ndarray:
+    # True where `slots_needed` consecutive free slots begin (same leading shape as grid)
+    n_slots = grid.shape[-1]
+    if slots_needed > n_slots:
+        return np.zeros(grid.shape[:-1] + (0,), dtype=bool)
+    free = np.concatenate(
+        [np.zeros(grid.shape[:-1] + (1,), dtype=np.int32), np.cumsum(~grid, axis=-1, dtype=np.int32)],
+        axis=-1
+    )
+    return (free[..., slots_needed:] - free[..., :-slots_needed]) == slots_needed
+
+
+def get_availability(db: Session, start_date: date, days: int = 1, court_id: Optional[int] = None, duration: Optional[int] = None):
+    if days < 1 or days > MAX_AVAILABILITY_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_AVAILABILITY_DAYS}")
+
+    open_min, close_min, slot = get_opening_hours(db)
+    duration = duration or slot
+    if duration <= 0:
+        raise ValueError("duration must be positive")
+    slots_needed = -(-duration // slot)
+
+    courts_query = db.query(Court.id, Court.name)
+    if court_id is not None:
+        courts_query = courts_query.filter(Court.id == court_id)
+    else:
+        courts_query = courts_query.filter(Court.active.isnot(False))
+    courts = courts_query.order_by(Court.id).all()
+    court_ids = [c.id for c in courts]
+
+    grid, holiday_mask = busy_grid(db, start_date, days, court_ids, open_min, close_min, slot)
+    starts = free_starts(grid, slots_needed)
+
+    result = []
+    for d in range(days):
+        day = start_date + timedelta(days=d)
+        for c, court in enumerate(courts):
+            slot_idx = np.flatnonzero(starts[d, c]) if starts.shape[-1] else []
+            result.append({
+                "date": day,
+                "court_id": court.id,
+                "court_name": court.name,
+                "holiday": bool(holiday_mask[d]),
+                "free_slots": [
+                    {
+                        "start_time": _format_minutes(open_min + int(j) * slot),
+                        "end_time": _format_minutes(open_min + int(j) * slot + duration),
+                    }
+                    for j in slot_idx
+                ],
+            })
+    return result
+
+
+SEARCH_CHUNK_DAYS = 14
+MAX_SEARCH_HORIZON_DAYS = 366
+
+
+def find_next_available(db: Session, after: datetime, duration: int, limit: int = 5,
+                        horizon_days: int = 60, court_id: Optional[int] = None,
+                        slot_aligned: bool = True):
+    """First `limit` free windows of `duration` minutes starting at or after `after`.
+
+    Scans forward in chunks of SEARCH_CHUNK_DAYS: one bookings query and one
+    holidays query per chunk, then an in-memory sweep over the sorted busy
+    intervals of each court-day. Results are ordered by start, then court.
+    """
+    if duration <= 0:
+        raise ValueError("duration must be positive")
+    if horizon_days < 1 or horizon_days > MAX_SEARCH_HORIZON_DAYS:
+        raise ValueError(f"horizon_days must be between 1 and {MAX_SEARCH_HORIZON_DAYS}")
+
+    open_min, close_min, slot = get_opening_hours(db)
+    step = slot if slot_aligned else 1
+
+    courts_query = db.query(Court.id, Court.name)
+    if court_id is not None:
+        courts_query = courts_query.filter(Court.id == court_id)
+    else:
+        courts_query = courts_query.filter(Court.active.isnot(False))
+    courts = courts_query.order_by(Court.id).all()
+    if not courts or close_min - open_min < duration:
+        return []
+    court_ids = [c.id for c in courts]
+
+    first_day = after.date()
+    last_day = first_day + timedelta(days=horizon_days - 1)
+    results = []
+    chunk_start = first_day
+    while chunk_start <= last_day and len(results) < limit:
+        chunk_end = min(chunk_start + timedelta(days=SEARCH_CHUNK_DAYS - 1), last_day)
+
+        holidays = {
+            r.date for r in db.query(Holiday.date).filter(
+                Holiday.date >= chunk_start,
+                Holiday.date <= chunk_end
+            )
+        }
+        busy = {}
+        rows = db.query(Booking.date, Booking.court_id, Booking.start_time, Booking.end_time).filter(
+            Booking.court_id.in_(court_ids),
+            Booking.date >= chunk_start,
+            Booking.date <= chunk_end,
+            Booking.start_time.isnot(None),
+            Booking.end_time.isnot(None)
+        ).order_by(Booking.date, Booking.court_id, Booking.start_time).all()
+        for r in rows:
+            busy.setdefault((r.date, r.court_id), []).append((_minutes(r.start_time), _minutes(r.end_time)))
+
+        day = chunk_start
+        while day <= chunk_end and len(results) < limit:
+            if day not in holidays:
+                earliest = open_min
+                if day == first_day:
+                    after_min = after.hour * 60 + after.minute + (1 if after.second or after.microsecond else 0)
+                    # Round up to the next slot boundary when slot aligned
+                    earliest = max(open_min, open_min + -(-(after_min - open_min) // step) * step)
+                day_hits = []
+                for court in courts:
+                    day_hits.extend(
+                        (start, court) for start in
+                        _sweep_free(busy.get((day, court.id), []), earliest, close_min, duration, step, open_min, limit)
+                    )
+                day_hits.sort(key=lambda h: (h[0], h[1].id))
+                for start, court in day_hits[:limit - len(results)]:
+                    results.append({
+                        "date": day,
+                        "court_id": court.id,
+                        "court_name": court.name,
+                        "start_time": _format_minutes(start),
+                        "end_time": _format_minutes(start + duration),
+                    })
+            day += timedelta(days=1)
+        chunk_start = chunk_end + timedelta(days=1)
+    return results
+
+
+def _sweep_free(intervals: list, earliest: int, close_min: int, duration: int, step: int, open_min: int, limit: int):
+    # Candidate starts in a sorted list of busy (start, end) minute intervals for one court-day
+    found = []
+    cursor = earliest
+    for busy_start, busy_end in intervals + [(close_min, close_min)]:
+        while cursor + duration <= min(busy_start, close_min) and len(found) < limit:
+            found.append(cursor)
+            cursor += step
+        if len(found) >= limit:
+            break
+        if busy_end > cursor:
+            # Jump past the busy interval, staying on the slot grid
+            cursor = open_min + -(-(busy_end - open_min) // step) * step
+    return found
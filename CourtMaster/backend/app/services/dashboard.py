@@ -0,0 +1,98 @@
+import asyncio
+import time
+import weakref
+
+from .. import crud
+from ..config import get_settings
+from ..database import AsyncSessionLocal, STATEMENT_TIMEOUT
+
+settings = get_settings()
+
+# At most DASHBOARD_WORKERS dashboard sections (and DB connections) in flight per event loop
+_limits = weakref.WeakKeyDictionary()
+# Per event loop: section key -> Task of the load in flight
+_flights = weakref.WeakKeyDictionary()
+
+
+def _section_limit() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _limits:
+        _limits[loop] = asyncio.Semaphore(settings.DASHBOARD_WORKERS)
+    return _limits[loop]
+
+
+async def _timed_section(fn):
+    # Each section runs on its own session: a session runs one statement at a time
+    async with _section_limit(), AsyncSessionLocal(info={STATEMENT_TIMEOUT: settings.REPORT_STATEMENT_TIMEOUT_MS}) as db:
+        start = time.perf_counter()
+        return await db.run_sync(fn), (time.perf_counter() - start) * 1000
+
+
+def _flight_done(flights: dict, key, task: asyncio.Task):
+    if flights.get(key) is task:
+        del flights[key]
+    if not task.cancelled():
+        task.exception()  # retrieved, even if every waiter went away
+
+
+async def run_section(key, fn):
+    """Run a sync crud aggregate `fn(db)` on its own session; returns (result, ms).
+
+    Concurrent calls with the same key share one load: report_cache coalesces
+    threads, but loads from async routes run on the event loop thread and
+    cannot block there waiting for each other, so they are coalesced here
+    instead. The load is a task of its own and is shielded, so a client that
+    disconnects does not cancel it for the others.
+    """
+    loop = asyncio.get_running_loop()
+    flights = _flights.setdefault(loop, {})
+    task = flights.get(key)
+    if task is None:
+        task = flights[key] = loop.create_task(_timed_section(fn))
+        task.add_done_callback(lambda t: _flight_done(flights, key, t))
+    return await asyncio.shield(task)
+
+
+# (key, fn) of the sections also served on their own by /reports/dashboard/stats and /charts
+def stats_section(period: str):
+    return ("stats", period), lambda db: crud.get_dashboard_stats(db, period=period)
+
+
+def daily_section(days: int):
+    return ("daily", days), lambda db: crud.get_daily_bookings_chart(db, days=days)
+
+
+def status_section():
+    return ("status",), crud.get_booking_status_distribution
+
+
+async def build_dashboard(period: str = "overall", days: int = 30):
+    """Run the dashboard aggregates concurrently; returns (payload, timings_ms).
+
+    Same data as /reports/dashboard/stats and /reports/dashboard/charts, so
+    the dashboard page needs one round trip and waits for the slowest query
+    instead of the sum of all of them.
+    """
+    sections = {
+        "stats": stats_section(period),
+        "daily": daily_section(days),
+        "status": status_section(),
+    }
+    done = await asyncio.gather(*(run_section(key, fn) for key, fn in sections.values()))
+
+    results, timings = {}, {}
+    for name, (result, ms) in zip(sections, done):
+        results[name], timings[name] = result, ms
+
+    payload = {
+        "stats": results["stats"],
+        "charts": {"daily": results["daily"], "status": results["status"]},
+    }
+    return payload, timings
+
+
+def server_timing(timings: dict, total_ms: float) -> str:
+    # Server-Timing header value, e.g. "stats;dur=12.4, daily;dur=3.1, total;dur=13.0"
+    parts = [f"{name};dur={ms:.1f}" for name, ms in timings.items()]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
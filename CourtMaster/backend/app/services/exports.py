@@ -0,0 +1,303 @@
+import csv
+import gzip
+import io
+import os
+import shutil
+from itertools import chain, islice
+from typing import Callable, Optional
+import openpyxl
+import orjson
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..database import SessionLocal
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MEDIA_TYPES = {
+    "xlsx": XLSX_MEDIA_TYPE,
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Column names of the machine-readable formats (csv, ndjson, parquet)
+EXPORT_FIELDS = ["id", "customer_name", "mobile", "date", "start_time", "end_time", "court_id", "status", "category"]
+BATCH_ROWS = 5000
+PARQUET_ROW_GROUP = 100000
+EXPORT_HEADERS = ["ID", "Customer Name", "Mobile", "Date", "Start Time", "End Time", "Court ID", "Status", "Category"]
+WIDTH_SAMPLE_ROWS = 500
+CHUNK_SIZE = 64 * 1024
+
+
+def _export_row(r):
+    return [r.id, r.customer_name, r.mobile, r.date, r.start_time, r.end_time, r.court_id, r.status, r.category]
+
+
+def _counted(rows, progress: Optional[Callable[[int], None]]):
+    # Report the running row count every BATCH_ROWS rows; the callback may raise to abort
+    if progress is None:
+        yield from rows
+        return
+    count = 0
+    for r in rows:
+        yield r
+        count += 1
+        if count % BATCH_ROWS == 0:
+            progress(count)
+
+
+def write_bookings_xlsx(db: Session, fileobj, progress: Optional[Callable[[int], None]] = None, **filters) -> int:
+    """Write the bookings export workbook to `fileobj`, returns the row count.
+
+    Rows are streamed from the DB with yield_per into a write-only workbook,
+    so memory does not grow with the export size. Column widths are
+    estimated from the first WIDTH_SAMPLE_ROWS rows. `filters` are passed to
+    crud.iter_booking_rows; `progress` gets the running row count.
+    """
+    rows = (_export_row(r) for r in _counted(crud.iter_booking_rows(db, **filters), progress))
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Bookings Report")
+
+    # Widths must be set before the first row in write-only mode
+    for i, header in enumerate(EXPORT_HEADERS):
+        max_length = max([len(header)] + [len(str(row[i])) for row in sample if row[i] is not None])
+        ws.column_dimensions[get_column_letter(i + 1)].width = max_length + 2
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid") # Indigo Primary
+    header_row = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        header_row.append(cell)
+    ws.append(header_row)
+
+    count = 0
+    for row in chain(sample, rows):
+        ws.append(row)
+        count += 1
+
+    wb.save(fileobj)
+    return count
+
+
+def iter_file(fileobj, chunk_size: int = CHUNK_SIZE):
+    # Stream a file from the start in chunks, closing (and so deleting, for temp files) it at the end
+    try:
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def _batches(rows, size: int = BATCH_ROWS):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _streamed(write_batches, filters: dict):
+    # Generators run after the endpoint has returned, so they own their DB session
+    db = SessionLocal()
+    try:
+        yield from write_batches(crud.iter_booking_rows(db, batch_size=BATCH_ROWS, **filters))
+    finally:
+        db.close()
+
+
+def _csv_batches(rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in _batches(rows):
+        writer.writerows(_export_row(r) for r in batch)
+        yield out.getvalue().encode("utf-8")
+        out.seek(0)
+        out.truncate(0)
+    if out.tell():
+        yield out.getvalue().encode("utf-8")
+
+
+def _ndjson_batches(rows):
+    for batch in _batches(rows):
+        yield b"".join(
+            orjson.dumps(dict(zip(EXPORT_FIELDS, _export_row(r)))) + b"\n" for r in batch
+        )
+
+
+def iter_bookings_csv(**filters):
+    # CSV bytes, one chunk per BATCH_ROWS rows; first byte goes out after the first batch
+    return _streamed(_csv_batches, filters)
+
+
+def iter_bookings_ndjson(**filters):
+    # Newline-delimited JSON bytes, one chunk per BATCH_ROWS rows
+    return _streamed(_ndjson_batches, filters)
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export requires pyarrow to be installed")
+    return pa, pq
+
+
+def _parquet_schema(pa):
+    return pa.schema([
+        ("id", pa.int64()),
+        ("customer_name", pa.string()),
+        ("mobile", pa.string()),
+        ("date", pa.date32()),
+        ("start_time", pa.time64("us")),
+        ("end_time", pa.time64("us")),
+        ("court_id", pa.int64()),
+        ("status", pa.string()),
+        ("category", pa.string()),
+    ])
+
+
+def _parquet_table(pa, schema, batch):
+    columns = list(zip(*(_export_row(r) for r in batch)))
+    return pa.Table.from_arrays(
+        [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+def write_bookings_parquet(db: Session, fileobj, progress: Optional[Callable[[int], None]] = None, **filters) -> int:
+    """Write the export as Parquet, one row group per PARQUET_ROW_GROUP rows.
+
+    pyarrow is optional; raises ValueError when it is not installed.
+    """
+    pa, pq = _pyarrow()
+    schema = _parquet_schema(pa)
+    count = 0
+    with pq.ParquetWriter(fileobj, schema, compression="snappy") as writer:
+        rows = _counted(crud.iter_booking_rows(db, batch_size=BATCH_ROWS, **filters), progress)
+        for batch in _batches(rows, PARQUET_ROW_GROUP):
+            writer.write_table(_parquet_table(pa, schema, batch))
+            count += len(batch)
+    return count
+
+
+# format -> file extension; a Parquet archive is a directory of part files
+ARCHIVE_FORMATS = {"ndjson": "ndjson.gz", "parquet": "parquet"}
+
+
+def _fsync_dir(path: str):
+    # Makes a rename inside `path` durable (POSIX only; Windows has no directory fsync)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class BookingArchive:
+    """Append-only archive of booking rows (bulk delete): gzip NDJSON or Parquet.
+
+    Each write() is one delete batch and is fsynced before it returns, so the
+    rows are on disk before that batch's delete commits, and a crash leaves
+    every earlier batch readable:
+
+    - ndjson: one file, one complete gzip member per batch (gzip tools read
+      concatenated members as one stream). A crash can only truncate the last
+      member.
+    - parquet: a directory with one finished file per batch (part-00000.parquet,
+      ...), since a single Parquet file is unreadable until its footer is
+      written on close. Parts are written under a temporary name and renamed.
+      Readers such as pyarrow.dataset, pandas and DuckDB load the directory
+      as one table.
+
+    The batch being written when the process died may not have been deleted,
+    and a re-run archives it again, so dedupe on id when reading.
+    """
+
+    def __init__(self, path: str, format: str = "ndjson"):
+        if format not in ARCHIVE_FORMATS:
+            raise ValueError(f"archive format must be one of: {', '.join(ARCHIVE_FORMATS)}")
+        self.path = path
+        self.format = format
+        self.rows = 0
+        self.parts = 0
+        if format == "parquet":
+            self._pa, self._pq = _pyarrow()
+            self._schema = _parquet_schema(self._pa)
+            os.makedirs(path)
+            self._file = None
+        else:
+            self._file = open(path, "wb")
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self.format == "parquet":
+            part = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+            with open(part + ".tmp", "wb") as f:
+                self._pq.write_table(_parquet_table(self._pa, self._schema, rows), f, compression="snappy")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(part + ".tmp", part)
+            _fsync_dir(self.path)
+        else:
+            self._file.write(gzip.compress(b"".join(_ndjson_batches(rows))))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self.parts += 1
+        self.rows += len(rows)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        # Drop the archive, e.g. when nothing was deleted
+        self.close()
+        if self.format == "parquet":
+            shutil.rmtree(self.path, ignore_errors=True)
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_bookings_export(db: Session, fileobj, format: str, progress: Optional[Callable[[int], None]] = None, **filters) -> int:
+    # Write any export format to a binary file (background jobs); returns the row count
+    if format == "xlsx":
+        return write_bookings_xlsx(db, fileobj, progress=progress, **filters)
+    if format == "parquet":
+        return write_bookings_parquet(db, fileobj, progress=progress, **filters)
+    if format not in ("csv", "ndjson"):
+        raise ValueError(f"Unknown export format: {format}")
+
+    count = 0
+    def counting(rows):
+        nonlocal count
+        for r in rows:
+            count += 1
+            yield r
+    write_batches = _csv_batches if format == "csv" else _ndjson_batches
+    rows = crud.iter_booking_rows(db, batch_size=BATCH_ROWS, **filters)
+    for chunk in write_batches(counting(_counted(rows, progress))):
+        fileobj.write(chunk)
+    return count
@@ -0,0 +1,184 @@
+import csv
+import io
+from collections import namedtuple
+from datetime import date, datetime, time
+from typing import Optional
+import openpyxl
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..config import get_settings
+from ..models.bookings import normalize_mobile
+from .exports import EXPORT_FIELDS, EXPORT_HEADERS
+
+settings = get_settings()
+
+IMPORT_FORMATS = ("xlsx", "csv")
+REQUIRED_FIELDS = ("customer_name", "date", "court_id", "start_time", "end_time")
+# Headers match a field name or its export header ("Customer Name"), ignoring case and spaces
+HEADER_FIELDS = {
+    **{f: f for f in EXPORT_FIELDS},
+    **{h.lower().replace(" ", "_"): f for h, f in zip(EXPORT_HEADERS, EXPORT_FIELDS)},
+}
+
+# One parsed file row; `row` is its 1-based line in the sheet (the header is row 1)
+ImportRow = namedtuple(
+    "ImportRow",
+    ["row", "customer_name", "mobile", "mobile_digits", "date", "court_id", "start_time", "end_time", "status", "category"]
+)
+
+
+def import_format(filename: Optional[str], format: Optional[str] = None) -> str:
+    # Explicit format, else the file extension
+    format = (format or (filename or "").rsplit(".", 1)[-1]).lower()
+    if format not in IMPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+    return format
+
+
+def _sheet_rows(fileobj, format: str):
+    # Cell value tuples, streamed: openpyxl read-only mode never loads the whole sheet
+    if format == "xlsx":
+        wb = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            yield from wb.worksheets[0].iter_rows(values_only=True)
+        finally:
+            wb.close()
+    else:
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        try:
+            yield from csv.reader(text)
+        finally:
+            text.detach()  # leave the caller's file open
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # numbers typed into Excel, e.g. mobiles
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _parse_time(value) -> time:
+    if isinstance(value, datetime):
+        return value.time()
+    if isinstance(value, time):
+        return value
+    # "18:00", "6:00" or "18:00:00"
+    return time(*(int(part) for part in value.split(":")))
+
+
+def _parse_int(value) -> int:
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    return int(value)
+
+
+PARSERS = {"date": _parse_date, "court_id": _parse_int, "start_time": _parse_time, "end_time": _parse_time}
+
+
+def parse_bookings(fileobj, format: str, max_rows: Optional[int] = None):
+    """Parse an xlsx or CSV bookings sheet into (rows, errors).
+
+    The first row holds the headers (the export's own headers work, so an
+    export can be re-imported; the id column is ignored). Cells are
+    converted by hand rather than through schemas.BookingCreate, which is
+    several times faster per row. errors are {"row", "reason"} for rows
+    that cannot be parsed; blank rows are skipped.
+    """
+    max_rows = max_rows or settings.BOOKING_IMPORT_MAX_ROWS
+    sheet = _sheet_rows(fileobj, format)
+    try:
+        return _parse_sheet(sheet, max_rows)
+    finally:
+        sheet.close()
+
+
+def _parse_sheet(sheet, max_rows: int):
+    header = next(sheet, None)
+    if header is None:
+        raise ValueError("The file is empty")
+    columns = {}
+    for i, name in enumerate(header):
+        field = HEADER_FIELDS.get(str(name or "").strip().lower().replace(" ", "_"))
+        if field and field != "id":
+            columns.setdefault(field, i)
+    missing = [f for f in REQUIRED_FIELDS if f not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    rows, errors = [], []
+    for line, cells in enumerate(sheet, start=2):
+        values = {f: _text(cells[i]) if i < len(cells) else None for f, i in columns.items()}
+        if not any(values.values()):
+            continue
+        if len(rows) + len(errors) >= max_rows:
+            raise ValueError(f"At most {max_rows} rows per import")
+
+        reason = None
+        for field in REQUIRED_FIELDS:
+            if values[field] is None:
+                reason = f"Missing {field}"
+                break
+            if field in PARSERS:
+                # Typed cells (xlsx dates, times, numbers) are converted as they are
+                raw = cells[columns[field]]
+                try:
+                    values[field] = PARSERS[field](values[field] if isinstance(raw, str) else raw)
+                except (TypeError, ValueError):
+                    reason = f"Invalid {field}: {values[field]}"
+                    break
+        if reason is None and values["end_time"] <= values["start_time"]:
+            reason = "end_time must be after start_time"
+        if reason:
+            errors.append({"row": line, "reason": reason})
+            continue
+
+        mobile = values.get("mobile")
+        rows.append(ImportRow(
+            row=line,
+            customer_name=values["customer_name"],
+            mobile=mobile,
+            mobile_digits=normalize_mobile(mobile),
+            date=values["date"],
+            court_id=values["court_id"],
+            start_time=values["start_time"],
+            end_time=values["end_time"],
+            status=values.get("status") or "booked",
+            category=values.get("category") or "booking",
+        ))
+    return rows, errors
+
+
+def import_bookings(db: Session, fileobj, format: str, mode: str = "all_or_nothing", dry_run: bool = False):
+    """Parse, validate and insert a bookings sheet; returns the import report.
+
+    mode works like POST /bookings/batch: "all_or_nothing" imports nothing
+    if any row fails, "best_effort" imports the valid rows. With dry_run
+    nothing is written. The report lists every failed row with its sheet
+    row number and reason.
+    """
+    if mode not in ("all_or_nothing", "best_effort"):
+        raise ValueError("Invalid mode")
+    rows, errors = parse_bookings(fileobj, format)
+    total = len(rows) + len(errors)
+    # Rows that parsed are still checked against the DB so one pass reports every problem
+    dry_run = dry_run or bool(errors and mode == "all_or_nothing")
+    imported, db_errors = crud.import_bookings(db, rows, mode=mode, dry_run=dry_run)
+    errors = sorted(errors + db_errors, key=lambda e: e["row"])
+    return {
+        "total_rows": total,
+        "imported": imported,
+        "failed": len(errors),
+        "errors": errors,
+    }
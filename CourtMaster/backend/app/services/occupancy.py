@@ -0,0 +1,157 @@
+import io
+from datetime import date, timedelta
+from itertools import chain
+from typing import Optional
+import numpy as np
+from sqlalchemy import Date, Integer, case, cast, extract, func, literal, select
+from sqlalchemy.orm import Session
+
+from ..models import Booking, Court, Holiday, Settings
+from .availability import get_opening_hours
+
+MAX_OCCUPANCY_DAYS = 731
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+DEFAULT_PRICE_PER_HOUR = 400
+# Column order of the booking array: court_id, day offset, start minute, end minute, revenue flag
+N_COLUMNS = 5
+
+
+def _booking_columns(db: Session, start_date: date, end_date: date, court_id: Optional[int]):
+    # Everything is reduced to integers in SQL so the driver hands back plain ints
+    if db.get_bind().dialect.name == "sqlite":
+        day = cast(func.julianday(Booking.date) - func.julianday(literal(start_date, Date)), Integer)
+        # Times are stored as 'HH:MM:SS' text; substr is much cheaper than strftime per row
+        minute = lambda t: cast(func.substr(t, 1, 2), Integer) * 60 + cast(func.substr(t, 4, 2), Integer)
+    else:
+        day = Booking.date - cast(literal(start_date), Date)  # date - date is an integer on Postgres
+        minute = lambda t: cast(extract('hour', t) * 60 + extract('minute', t), Integer)
+    stmt = select(
+        Booking.court_id,
+        day,
+        minute(Booking.start_time),
+        minute(Booking.end_time),
+        case((Booking.category == 'booking', 1), else_=0)
+    ).where(
+        Booking.date >= start_date,
+        Booking.date <= end_date,
+        # Same statuses as the dashboard stats and the revenue pivot
+        func.lower(Booking.status).in_(["confirmed", "booked"]),
+        Booking.court_id.isnot(None),
+        Booking.start_time.isnot(None),
+        Booking.end_time.isnot(None)
+    )
+    if court_id is not None:
+        stmt = stmt.where(Booking.court_id == court_id)
+    return stmt
+
+
+def booking_arrays(db: Session, start_date: date, end_date: date, court_id: Optional[int] = None) -> np.ndarray:
+    """(N, 5) int32 array of court_id, day offset, start minute, end minute, revenue flag.
+
+    Postgres streams the rows with COPY ... TO STDOUT as CSV and NumPy parses
+    the buffer in C; SQLite has no bulk export, so the driver's tuples are
+    flattened straight into the array. Either way no ORM rows are built.
+    """
+    bind = db.get_bind()
+    sql = str(_booking_columns(db, start_date, end_date, court_id).compile(
+        dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+    ))
+    cursor = db.connection().connection.cursor()
+    try:
+        if bind.dialect.name == "postgresql":
+            buffer = io.BytesIO()
+            cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", buffer)
+            if not buffer.tell():
+                return np.zeros((0, N_COLUMNS), dtype=np.int32)
+            buffer.seek(0)
+            return np.loadtxt(buffer, delimiter=",", dtype=np.int32, ndmin=2)
+        cursor.execute(sql)
+        return np.fromiter(chain.from_iterable(cursor), dtype=np.int32).reshape(-1, N_COLUMNS)
+    finally:
+        cursor.close()
+
+
+def _hour_overlap(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Minutes of each [start, end) interval falling in each hour of the day, shape (N, 24)
+    hour_starts = np.arange(24, dtype=np.int32) * 60
+    return np.clip(
+        np.minimum(ends[:, None], hour_starts + 60) - np.maximum(starts[:, None], hour_starts),
+        0, 60
+    )
+
+
+def get_occupancy_matrix(db: Session, start_date: date, end_date: date, court_id: Optional[int] = None):
+    """Courts x weekday x hour-of-day occupancy over an inclusive date range.
+
+    Only confirmed/booked bookings count, like the dashboard stats.
+    booked_minutes and revenue count whole bookings. booked_fraction only
+    counts the minutes inside opening hours, divided by the open minutes
+    of that weekday and hour over the non-holiday days in the range.
+    Matrices are nested lists indexed [court][weekday][hour], in the order of
+    `courts`, `weekdays` (Mon first) and `hours`.
+    """
+    n_days = (end_date - start_date).days + 1
+    if n_days < 1 or n_days > MAX_OCCUPANCY_DAYS:
+        raise ValueError(f"Date range must cover 1 to {MAX_OCCUPANCY_DAYS} days")
+
+    open_min, close_min, _ = get_opening_hours(db)
+    settings = db.query(Settings.price_per_hour).first()
+    price_per_hour = settings.price_per_hour if settings and settings.price_per_hour else DEFAULT_PRICE_PER_HOUR
+
+    data = booking_arrays(db, start_date, end_date, court_id)
+    court_col, day_col, starts, ends, revenue_flag = data.T
+
+    if court_id is not None:
+        court_ids = np.array([court_id], dtype=np.int32)
+    else:
+        active = [c.id for c in db.query(Court.id).filter(Court.active.isnot(False))]
+        court_ids = np.union1d(np.array(active, dtype=np.int32), court_col)
+    n_courts = len(court_ids)
+
+    # Flat cell index per booking and hour: ((court * 7) + weekday) * 24 + hour
+    weekday = (start_date.weekday() + day_col) % 7
+    cells = (np.searchsorted(court_ids, court_col) * 7 + weekday) * 24
+    cells = (cells[:, None] + np.arange(24)).ravel()
+    size = n_courts * 7 * 24
+
+    # Holidays are closed: they count neither as open time nor as booked open time
+    holidays = {
+        r.date for r in db.query(Holiday.date).filter(
+            Holiday.date >= start_date,
+            Holiday.date <= end_date
+        )
+    }
+    open_days = np.array(
+        [start_date + timedelta(days=d) not in holidays for d in range(n_days)], dtype=np.int64
+    )
+    days_per_weekday = np.bincount((start_date.weekday() + np.arange(n_days)) % 7, weights=open_days, minlength=7)
+
+    overlap = _hour_overlap(starts, ends)
+    booked = np.bincount(cells, weights=overlap.ravel(), minlength=size)
+    revenue_minutes = np.bincount(cells, weights=(overlap * revenue_flag[:, None]).ravel(), minlength=size)
+    in_hours = _hour_overlap(np.clip(starts, open_min, close_min), np.clip(ends, open_min, close_min))
+    in_hours *= open_days[day_col][:, None].astype(in_hours.dtype)
+    booked_open = np.bincount(cells, weights=in_hours.ravel(), minlength=size)
+    shape = (n_courts, 7, 24)
+    booked, revenue_minutes, booked_open = (a.reshape(shape) for a in (booked, revenue_minutes, booked_open))
+
+    # Open minutes per (weekday, hour): non-holiday days of each weekday x open minutes of each hour
+    open_per_hour = _hour_overlap(np.array([open_min]), np.array([close_min]))[0]
+    available = days_per_weekday[:, None] * open_per_hour[None, :]
+
+    fraction = np.divide(booked_open, available, out=np.zeros(shape), where=available > 0)
+
+    # Only hours that are open or saw bookings
+    hours = np.flatnonzero((open_per_hour > 0) | booked.any(axis=(0, 1)))
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "price_per_hour": price_per_hour,
+        "courts": court_ids.tolist(),
+        "weekdays": WEEKDAYS,
+        "hours": hours.tolist(),
+        "open_minutes": available[:, hours].astype(int).tolist(),
+        "booked_minutes": booked[:, :, hours].astype(int).tolist(),
+        "booked_fraction": np.round(fraction[:, :, hours], 4).tolist(),
+        "revenue": np.round(revenue_minutes[:, :, hours] * price_per_hour / 60, 2).tolist(),
+    }
@@ -0,0 +1,130 @@
+import threading
+import time as _time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import date, time
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Booking
+
+settings = get_settings()
+
+
+class OverlapIndex:
+    """In-process record of intervals this process booked, per (court_id, date).
+
+    Entries are filled only by add() after a successful insert: a lookup never
+    queries on a miss, so a court-day the index knows nothing about costs
+    nothing and the insert's constraint decides. An overlap with a recorded
+    interval is confirmed with one indexed EXISTS query before the booking is
+    rejected, because the row may have been deleted by another process since;
+    that is still cheaper than a failed insert and its rollback. The index can
+    only save work on repeated attempts at a taken slot, never cause a wrong
+    rejection or a double booking.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # (court_id, date) -> (added_at, [(start, end), ...])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejections = 0
+        self.stale = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        added_at, intervals = entry
+        if _time.monotonic() - added_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return intervals
+
+    def _confirm(self, db: Session, court_id: int, day: date, start_time: time, end_time: time) -> bool:
+        return db.query(db.query(Booking.id).filter(
+            Booking.court_id == court_id,
+            Booking.date == day,
+            Booking.start_time < end_time,
+            Booking.end_time > start_time
+        ).exists()).scalar()
+
+    def conflicts(self, db: Session, court_id: int, day: date, start_time: time, end_time: time) -> bool:
+        # True only for a confirmed overlap with a recorded interval; False means "ask the insert"
+        if not self.enabled:
+            return False
+        with self._lock:
+            intervals = self._get((court_id, day))
+            # Intervals are sorted by start: the last one starting before our end
+            # is the only candidate that can still be running at our start.
+            i = bisect_left(intervals, (end_time,)) if intervals else 0
+            overlap = i > 0 and intervals[i - 1][1] > start_time
+            if overlap:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not overlap:
+            return False
+        if not self._confirm(db, court_id, day, start_time, end_time):
+            self.invalidate(court_id, day)
+            with self._lock:
+                self.stale += 1
+            return False
+        with self._lock:
+            self.rejections += 1
+        return True
+
+    def add(self, court_id: int, day: date, start_time: time, end_time: time):
+        if not self.enabled:
+            return
+        key = (court_id, day)
+        with self._lock:
+            intervals = self._get(key)
+            if intervals is None:
+                intervals = []
+            insort(intervals, (start_time, end_time))
+            # The TTL runs from the latest insert: older intervals may have been deleted elsewhere
+            self._entries[key] = (_time.monotonic(), intervals)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, court_id: int, day: date):
+        with self._lock:
+            self._entries.pop((court_id, day), None)
+
+    def invalidate_range(self, start_date: date, end_date: date, court_id: Optional[int] = None):
+        with self._lock:
+            for key in [k for k in self._entries if start_date <= k[1] <= end_date]:
+                if court_id is None or key[0] == court_id:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "rejections": self.rejections,
+                "stale": self.stale,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+overlap_index = OverlapIndex(
+    max_entries=settings.OVERLAP_INDEX_SIZE,
+    ttl_seconds=settings.OVERLAP_INDEX_TTL
+)
@@ -0,0 +1,151 @@
+import threading
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# Postgres monthly range partitions of `bookings` (see alembic revision a4d27c9e13b8).
+# Partitions are named bookings_pYYYYMM and cover [first of month, first of next month);
+# dates without one land in the DEFAULT partition bookings_default, so an insert never
+# needs DDL. Each partition carries its own no-overlap exclusion constraint: overlaps can
+# only happen on the same date, and a month's rows all sit in one partition, so this gives
+# the same guarantee as the old table-wide one (which Postgres does not allow on a
+# partitioned table). Monthly partitions are created ahead of time, at startup and by
+# scripts/ensure_partitions.py (run it daily from cron), never while serving a request.
+# On SQLite, or a Postgres database that was not migrated, everything here is a no-op.
+PARTITION_PREFIX = "bookings_p"
+DEFAULT_PARTITION = "bookings_default"
+OVERLAP_EXCLUDE = "EXCLUDE USING gist (court_id WITH =, tsrange(date + start_time, date + end_time) WITH &&)"
+
+_lock = threading.Lock()
+_partitioned: Optional[bool] = None
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_ddl(month: date) -> List[str]:
+    name = partition_name(month)
+    return [
+        f"CREATE TABLE {name} PARTITION OF bookings "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')",
+        f"ALTER TABLE {name} ADD CONSTRAINT {name}_no_overlap {OVERLAP_EXCLUDE}",
+    ]
+
+
+def is_partitioned(db: Session) -> bool:
+    # Checked once per process; restart the app after running the partitioning migration
+    # The lock is never held across a query: async routes run this on the event loop thread,
+    # where blocking on a lock held by another request would stall the loop
+    global _partitioned
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    if _partitioned is None:
+        partitioned = bool(db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('bookings'))"
+        )).scalar())
+        with _lock:
+            _partitioned = partitioned
+    return _partitioned
+
+
+def _existing_months(db) -> set:
+    # Read from the catalog each time: other processes add partitions
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('bookings')"
+    )).scalars()
+    return {
+        date(int(name[-6:-2]), int(name[-2:]), 1)
+        for name in names if name.startswith(PARTITION_PREFIX)
+    }
+
+
+def _default_has_rows(db, start_date: date, end_date: date) -> bool:
+    return bool(db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= :start AND date <= :end)"),
+        {"start": start_date, "end": end_date}
+    ).scalar())
+
+
+def _is_lock_timeout(e: OperationalError) -> bool:
+    # 55P03 = lock_not_available, raised when lock_timeout expires
+    return getattr(e.orig, "pgcode", None) == "55P03" or "lock timeout" in str(e.orig)
+
+
+def ensure_partitions(db: Session, months: Iterable[date]) -> Tuple[List[date], List[date]]:
+    """Create the missing monthly partitions; returns (created, skipped) month starts.
+
+    Creating a partition takes ACCESS EXCLUSIVE locks on `bookings` and the
+    default partition, so each month runs in its own short transaction on a
+    separate connection with PARTITION_LOCK_TIMEOUT_MS: behind a long query
+    it gives up (and is retried by the next run) rather than queue every
+    booking request behind it. Months that already have rows in the default
+    partition are skipped: Postgres would have to move them, which needs a
+    maintenance window (detach the default, create the month, move the rows).
+    """
+    created, skipped = [], []
+    if not is_partitioned(db):
+        return created, skipped
+    missing = sorted({month_start(m) for m in months} - _existing_months(db))
+    for month in missing:
+        try:
+            with db.get_bind().begin() as conn:
+                conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(settings.PARTITION_LOCK_TIMEOUT_MS)}")
+                # Serializes workers creating partitions at the same time
+                conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('bookings_partitions'))"))
+                if month in _existing_months(conn):
+                    continue
+                if _default_has_rows(conn, month, next_month(month) - timedelta(days=1)):
+                    skipped.append(month)
+                    continue
+                for statement in partition_ddl(month):
+                    conn.execute(text(statement))
+            created.append(month)
+        except OperationalError as e:
+            if not _is_lock_timeout(e):
+                raise
+            skipped.append(month)
+    return created, skipped
+
+
+def ensure_future_partitions(db: Session, today: Optional[date] = None):
+    # Keep BOOKING_PARTITIONS_AHEAD months of partitions ready (startup and the cron script)
+    month = month_start(today or date.today())
+    months = []
+    for _ in range(settings.BOOKING_PARTITIONS_AHEAD + 1):
+        months.append(month)
+        month = next_month(month)
+    return ensure_partitions(db, months)
+
+
+def whole_months(db: Session, start_date: date, end_date: date) -> Optional[List[date]]:
+    # For an inclusive range made of whole months on a partitioned table: the months that
+    # have a partition. None otherwise, or when some of the range's rows sit in the default
+    # partition (those can only be deleted row by row).
+    if not is_partitioned(db) or start_date.day != 1 or (end_date + timedelta(days=1)).day != 1:
+        return None
+    if _default_has_rows(db, start_date, end_date):
+        return None
+    existing = _existing_months(db)
+    months = []
+    month = start_date
+    while month <= end_date:
+        if month in existing:
+            months.append(month)
+        month = next_month(month)
+    return months
@@ -0,0 +1,167 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the wait/hold histogram buckets; the last bucket is unbounded
+DURATION_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    # Counts per bucket (not cumulative) plus count and sum, like a Prometheus histogram
+    def __init__(self, bounds=DURATION_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self):
+        labels = [f"le_{b}" for b in self.bounds] + ["inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0.0,
+        }
+
+
+class PoolMetrics:
+    """Connection pool counters for one engine, fed by SQLAlchemy pool events.
+
+    checkout/checkin events give the checked-out and overflow levels seen by
+    each checkout and how long connections are held. Pools have no event for
+    "waiting for a connection", so the wait histogram comes from the Timed*
+    pool classes below, which time the pool's own get.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.checked_out_levels: Dict[int, int] = {}  # checked-out count at checkout -> times seen
+        self.overflow_levels: Dict[int, int] = {}
+        self.wait_ms = Histogram()
+        self.hold_ms = Histogram()
+
+    def attach(self, engine):
+        # engine: a sync Engine (AsyncEngine.sync_engine for the async one)
+        self.pool = engine.pool
+        engine.pool.metrics = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        checked_out = self.pool.checkedout()
+        overflow = max(self.pool.overflow(), 0)
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.checked_out_levels[checked_out] = self.checked_out_levels.get(checked_out, 0) + 1
+            self.overflow_levels[overflow] = self.overflow_levels.get(overflow, 0) + 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        with self._lock:
+            self.checkins += 1
+            if started is not None:
+                self.hold_ms.observe((time.perf_counter() - started) * 1000)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_ms.observe(seconds * 1000)
+            if timed_out:
+                self.timeouts += 1
+
+    def stats(self):
+        pool = self.pool
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                "size": pool.size(),
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "timeout_seconds": pool.timeout(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "peak_checked_out": self.peak_checked_out,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checked_out_at_checkout": {str(k): v for k, v in sorted(self.checked_out_levels.items())},
+                "overflow_at_checkout": {str(k): v for k, v in sorted(self.overflow_levels.items())},
+                "wait_ms": self.wait_ms.snapshot(),
+                "hold_ms": self.hold_ms.snapshot(),
+            }
+
+
+class _TimedGet:
+    # Times each wait for a pooled connection (including pool_timeout failures)
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class TimedQueuePool(_TimedGet, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedGet, AsyncAdaptedQueuePool):
+    pass
+
+
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def register(name: str, engine) -> PoolMetrics:
+    _registry[name] = metrics = PoolMetrics(name).attach(engine)
+    return metrics
+
+
+def stats():
+    return {name: metrics.stats() for name, metrics in _registry.items()}
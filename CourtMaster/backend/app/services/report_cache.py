@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time as _time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Hashable, Optional, Tuple
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# Inclusive (start, end) of the booking dates a cached value was computed from;
+# None on either side means unbounded.
+DateRange = Tuple[Optional[date], Optional[date]]
+ALL_DATES: DateRange = (None, None)
+
+
+class _Flight:
+    # One in-progress load that concurrent identical misses wait on
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class ReportCache:
+    """In-process TTL + LRU cache for dashboard and report aggregates.
+
+    Entries remember the booking date range they cover; booking writes drop only
+    the entries whose range contains a written date. Concurrent misses for the
+    same key are coalesced so a burst of refreshes runs the query once.
+    The cache is per process: other workers' writes are only picked up after
+    the TTL, which bounds how stale a number can get.
+    Loads coming from async routes (AsyncSession.run_sync runs them on the
+    event loop thread) cannot wait here: that would block the loop the other
+    load may be running on. Async routes coalesce one level up instead
+    (dashboard.run_section), so this only happens when a thread is loading the
+    same key; those loads run on their own and are counted as "uncoalesced".
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (loaded_at, (start, end), value)
+        self._flights = {}  # key -> _Flight
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlapped one is returned but not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.uncoalesced = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        loaded_at, _, value = entry
+        if _time.monotonic() - loaded_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_or_load(self, key: Hashable, date_range: DateRange, loader: Callable):
+        if not self.enabled:
+            return loader()
+
+        leader = False
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[2]
+            flight = self._flights.get(key)
+            if flight is not None and _on_event_loop():
+                self.uncoalesced += 1
+                flight = None
+            elif flight is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+                generation = self._generation
+        if flight is None:
+            return loader()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if flight.error is None and generation == self._generation:
+                    self._entries[key] = (_time.monotonic(), date_range, flight.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return flight.value
+
+    def invalidate_dates(self, *days: date):
+        # Drop entries whose range contains any of the given booking dates
+        days = set(days)
+        if not days:
+            return
+        with self._lock:
+            self._generation += 1
+            for key, (_, (start, end), _) in list(self._entries.items()):
+                if any((start is None or start <= d) and (end is None or d <= end) for d in days):
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def invalidate_range(self, start_date: date, end_date: date):
+        # Drop entries whose range overlaps [start_date, end_date]
+        with self._lock:
+            self._generation += 1
+            for key, (_, (start, end), _) in list(self._entries.items()):
+                if (start is None or start <= end_date) and (end is None or start_date <= end):
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def clear(self):
+        # Settings (price, opening hours) and courts feed every aggregate
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced + self.uncoalesced
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "uncoalesced": self.uncoalesced,
+                "invalidations": self.invalidations,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            }
+
+
+report_cache = ReportCache(
+    max_entries=settings.REPORT_CACHE_SIZE,
+    ttl_seconds=settings.REPORT_CACHE_TTL
+)
@@ -0,0 +1,322 @@
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import orjson
+
+from .. import crud
+from ..config import get_settings
+from ..database import SessionLocal
+from . import exports
+
+settings = get_settings()
+
+# Background report jobs: a process pool runs exports/aggregates off the request
+# workers and writes the result into a spool directory. Job state lives next to
+# the output as <id>.meta.json, so every API worker on the host sees the same jobs.
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+MEDIA_TYPES = dict(exports.MEDIA_TYPES, json="application/json")
+DATE_FILTERS = ("target_date", "start_date", "end_date")
+META_SUFFIX = "meta.json"
+
+_executor = None
+_executor_lock = threading.Lock()
+_futures = {}  # job_id -> Future, for jobs submitted by this process
+_futures_lock = threading.Lock()
+# Jobs record the process that queued them: a job whose owner is gone will never finish
+_OWNER = {"host": socket.gethostname(), "pid": os.getpid()}
+
+
+class JobLimitError(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def spool_dir() -> str:
+    path = settings.REPORT_JOB_DIR or os.path.join(tempfile.gettempdir(), "courtmaster-report-jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _path(job_id: str, suffix: str) -> str:
+    return os.path.join(spool_dir(), f"{job_id}.{suffix}")
+
+
+def _valid_id(job_id: str) -> bool:
+    # Ids become file names: only accept what submit_job generates
+    try:
+        return uuid.UUID(hex=job_id).hex == job_id
+    except ValueError:
+        return False
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _read(job_id: str) -> Optional[dict]:
+    try:
+        with open(_path(job_id, META_SUFFIX)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write(meta: dict):
+    # Atomic replace so pollers never read a half-written file
+    path = _path(meta["id"], META_SUFFIX)
+    with open(path + ".tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(path + ".tmp", path)
+
+
+def _update(job_id: str, **changes) -> Optional[dict]:
+    meta = _read(job_id)
+    if meta is None:
+        return None
+    meta.update(changes)
+    _write(meta)
+    return meta
+
+
+def _cancel_requested(job_id: str) -> bool:
+    return os.path.exists(_path(job_id, "cancel"))
+
+
+def _remove_files(job_id: str):
+    prefix = f"{job_id}."
+    for name in os.listdir(spool_dir()):
+        if name.startswith(prefix):
+            try:
+                os.remove(os.path.join(spool_dir(), name))
+            except FileNotFoundError:
+                pass
+
+
+def _run_job(job_id: str):
+    # Runs in a pool process with its own engine and session
+    meta = _read(job_id)
+    if meta is None:
+        return
+    if _cancel_requested(job_id):
+        _update(job_id, status="cancelled", finished_at=_now())
+        return
+    _update(job_id, status="running", started_at=_now())
+
+    def progress(rows):
+        # Called every exports.BATCH_ROWS rows: publish progress, honour cancellation
+        if _cancel_requested(job_id):
+            raise JobCancelled()
+        _update(job_id, rows=rows)
+
+    filters = {
+        key: date.fromisoformat(value) if key in DATE_FILTERS and value else value
+        for key, value in meta["filters"].items()
+    }
+    part = _path(job_id, "part")
+    db = SessionLocal()
+    try:
+        with open(part, "wb") as f:
+            if meta["kind"] == "capacity":
+                heatmap = crud.get_court_capacity_heatmap(db, filters["start_date"], filters["end_date"])
+                f.write(orjson.dumps(heatmap))
+                rows = len(heatmap)
+            else:
+                rows = exports.write_bookings_export(db, f, meta["format"], progress=progress, **filters)
+        output = _path(job_id, meta["format"])
+        os.replace(part, output)
+        _update(job_id, status="done", rows=rows, size=os.path.getsize(output), finished_at=_now())
+    except JobCancelled:
+        _update(job_id, status="cancelled", finished_at=_now())
+    except Exception as e:
+        _update(job_id, status="failed", error=str(e), finished_at=_now())
+    finally:
+        db.close()
+        if os.path.exists(part):
+            os.remove(part)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: children must not inherit the parent's pooled DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _reset_executor():
+    # A broken pool rejects all further work; the next submit starts a fresh one
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _is_lost(meta: dict) -> bool:
+    # Queued/running job that nothing will ever finish: its owner process on this host
+    # exited (restart, crash), or it is ours but its future is gone. Jobs owned by
+    # another host sharing the spool dir cannot be checked and are left alone.
+    owner = meta.get("owner")
+    if owner is None:
+        return True  # written before owners were recorded, so before the last restart
+    if owner["host"] != _OWNER["host"]:
+        return False
+    if owner["pid"] == _OWNER["pid"]:
+        return meta["id"] not in _futures
+    return not _pid_alive(owner["pid"])
+
+
+def _fail_if_lost(meta: dict) -> dict:
+    # Lost jobs are failed so they stop counting towards REPORT_JOB_MAX_ACTIVE
+    if meta["status"] not in ACTIVE_STATUSES:
+        return meta
+    with _futures_lock:
+        # Re-read: the worker may have finished (and its future been dropped) since
+        meta = _read(meta["id"]) or meta
+        if meta["status"] in ACTIVE_STATUSES and _is_lost(meta):
+            meta = _update(meta["id"], status="failed", error="Lost when the server restarted", finished_at=_now()) or meta
+    return meta
+
+
+def list_jobs():
+    cleanup()
+    jobs = []
+    for name in os.listdir(spool_dir()):
+        if name.endswith(f".{META_SUFFIX}"):
+            meta = _read(name.split(".")[0])
+            if meta is not None:
+                jobs.append(_fail_if_lost(meta))
+    return sorted(jobs, key=lambda j: j["created_at"], reverse=True)
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    if not _valid_id(job_id):
+        return None
+    meta = _read(job_id)
+    return _fail_if_lost(meta) if meta is not None else None
+
+
+def submit_job(kind: str, format: str, **filters) -> dict:
+    # Raises JobLimitError when REPORT_JOB_MAX_ACTIVE jobs are already queued or running
+    if kind == "capacity":
+        if not filters.get("start_date") or not filters.get("end_date"):
+            raise ValueError("capacity jobs need start_date and end_date")
+        format = "json"
+        filters = {"start_date": filters["start_date"], "end_date": filters["end_date"]}
+        filename = f"capacity_{filters['start_date']}_{filters['end_date']}.json"
+    else:
+        filename = f"bookings_export_{filters.get('target_date') or 'all'}.{format}"
+
+    active = [j for j in list_jobs() if j["status"] in ACTIVE_STATUSES]
+    if len(active) >= settings.REPORT_JOB_MAX_ACTIVE:
+        raise JobLimitError(f"Too many report jobs in progress (max {settings.REPORT_JOB_MAX_ACTIVE})")
+
+    meta = {
+        "id": uuid.uuid4().hex,
+        "owner": _OWNER,
+        "kind": kind,
+        "format": format,
+        "status": "queued",
+        "created_at": _now(),
+        "filename": filename,
+        "filters": {
+            key: value.isoformat() if isinstance(value, date) else value
+            for key, value in filters.items()
+        },
+    }
+    # Under the lock so a concurrent list_jobs never sees the job without its future
+    with _futures_lock:
+        _write(meta)
+        future = _get_executor().submit(_run_job, meta["id"])
+        _futures[meta["id"]] = future
+    future.add_done_callback(lambda f, job_id=meta["id"]: _job_finished(job_id, f))
+    return meta
+
+
+def _job_finished(job_id: str, future):
+    with _futures_lock:
+        _futures.pop(job_id, None)
+    if future.cancelled():
+        # Dropped from the queue (cancel_job or shutdown) before it started
+        meta = _read(job_id)
+        if meta is not None and meta["status"] in ACTIVE_STATUSES:
+            _update(job_id, status="cancelled", finished_at=_now())
+        return
+    if future.exception() is None:
+        return
+    # The worker process died (e.g. killed for memory); _run_job could not record it
+    _update(job_id, status="failed", error=f"Worker failed: {future.exception()!r}", finished_at=_now())
+    if isinstance(future.exception(), BrokenProcessPool):
+        _reset_executor()
+
+
+def cancel_job(job_id: str) -> Optional[dict]:
+    # Queued here: dropped from the pool. Running (or queued by another worker):
+    # flagged, the job stops at its next batch. Finished: output and state are deleted.
+    meta = get_job(job_id)
+    if meta is None:
+        return None
+    if meta["status"] in ACTIVE_STATUSES:
+        with _futures_lock:
+            future = _futures.get(job_id)
+        if future is not None and future.cancel():
+            return _update(job_id, status="cancelled", finished_at=_now())
+        open(_path(job_id, "cancel"), "w").close()
+        return meta
+    _remove_files(job_id)
+    return meta
+
+
+def output_path(meta: dict) -> Optional[str]:
+    path = _path(meta["id"], meta["format"])
+    if meta["status"] != "done" or not os.path.exists(path):
+        return None
+    return path
+
+
+def cleanup():
+    # Remove jobs finished more than REPORT_JOB_RETENTION seconds ago (lost jobs are
+    # marked failed by list_jobs, so they age out the same way). Queued and running jobs
+    # are never removed, however old: a long export or a backed-up pool is still live.
+    cutoff = (datetime.now() - timedelta(seconds=settings.REPORT_JOB_RETENTION)).isoformat()
+    for name in os.listdir(spool_dir()):
+        if not name.endswith(f".{META_SUFFIX}"):
+            continue
+        meta = _read(name.split(".")[0])
+        if meta is None:
+            continue
+        if meta["status"] in FINISHED_STATUSES and meta.get("finished_at") and meta["finished_at"] < cutoff:
+            _remove_files(meta["id"])
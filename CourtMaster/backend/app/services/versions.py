@@ -0,0 +1,49 @@
+import hashlib
+from datetime import date
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from ..database import dialect_insert
+from ..models import ChangeVersion
+
+# Keys
+BOOKINGS = "bookings"  # bumped by bulk operations that touch many dates at once
+COURTS = "courts"
+SETTINGS = "settings"
+
+
+def booking_date_key(day: date) -> str:
+    return f"bookings:{day.isoformat()}"
+
+
+def bump(db: Session, *keys: str):
+    # Increment the given counters inside the caller's transaction; the caller commits
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    stmt = dialect_insert(db)(ChangeVersion)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"version": ChangeVersion.version + 1}
+    )
+    db.execute(stmt, [{"key": key, "version": 1} for key in keys])
+
+
+def etag(db: Session, request: Request, *keys: str) -> str:
+    # Weak ETag from the current counters plus the query string (filters, paging).
+    # Read before the main query so a concurrent write can only make it look older.
+    rows = dict(db.query(ChangeVersion.key, ChangeVersion.version).filter(ChangeVersion.key.in_(keys)).all())
+    state = ",".join(f"{key}={rows.get(key, 0)}" for key in keys)
+    digest = hashlib.sha1(f"{state}|{request.url.query}".encode()).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, response: Response, tag: str) -> Optional[Response]:
+    # 304 if the client already has this version, otherwise tag the outgoing response
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and tag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
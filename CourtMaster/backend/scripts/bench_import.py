@@ -0,0 +1,57 @@
+import sys
+import os
+import csv
+import io
+import time
+from datetime import date, time as dtime, timedelta
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+from app.services.imports import import_bookings
+
+# Benchmark: bulk import of a generated bookings CSV (parse, validate, insert).
+# Runs against a throwaway in-memory SQLite database.
+# Usage: python scripts/bench_import.py [ROWS] [COURTS]
+
+def sheet(rows, courts):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["Customer Name", "Mobile", "Date", "Start Time", "End Time", "Court ID", "Status", "Category"])
+    day = date(2025, 1, 1)
+    n = 0
+    while n < rows:
+        for court in range(1, courts + 1):
+            for hour in range(6, 22):
+                if n == rows:
+                    break
+                writer.writerow([f"Customer {n}", f"98{n:08d}", day.isoformat(), f"{hour:02d}:00", f"{hour + 1:02d}:00",
+                                 court, "booked", "booking"])
+                n += 1
+        day += timedelta(days=1)
+    return buffer.getvalue().encode()
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    courts = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.Settings(slot_duration=60, open_time=dtime(6, 0), close_time=dtime(22, 0), price_per_hour=400))
+    db.add_all([models.Court(id=i, name=f"Court {i}", active=True) for i in range(1, courts + 1)])
+    db.commit()
+    data = sheet(rows, courts)
+
+    started = time.perf_counter()
+    result = import_bookings(db, io.BytesIO(data), "csv")
+    elapsed = time.perf_counter() - started
+    print(f"Import: {result['total_rows']:,} rows -> {result['imported']:,} imported, "
+          f"{result['failed']:,} failed in {elapsed:.2f} s")
+    db.close()
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+from datetime import date, time as dtime, timedelta
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+from app.services.occupancy import get_occupancy_matrix
+
+# Benchmark: hour-of-week occupancy matrix over a year of bookings.
+# Runs against a throwaway in-memory SQLite database.
+# Usage: python scripts/bench_occupancy.py [COURTS] [DAYS] [REPEATS]
+
+def seed(db, courts, days):
+    db.add(models.Settings(slot_duration=60, open_time=dtime(6, 0), close_time=dtime(22, 0), price_per_hour=400))
+    db.add_all([models.Court(id=i, name=f"Court {i}", active=True) for i in range(1, courts + 1)])
+    start = date(2025, 1, 1)
+    bookings = []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        for court in range(1, courts + 1):
+            # Deterministic pattern of busy hours, denser in the evening
+            for hour in range(6, 22):
+                if (d + court * 3 + hour) % 4 == 0 or hour >= 18:
+                    bookings.append({
+                        "customer_name": f"Customer {d}-{court}-{hour}",
+                        "date": day,
+                        "court_id": court,
+                        "start_time": dtime(hour, 0),
+                        "end_time": dtime(hour + 1, 0),
+                        "status": "booked",
+                        "category": "booking",
+                    })
+    db.execute(models.Booking.__table__.insert(), bookings)
+    db.commit()
+    return start, start + timedelta(days=days - 1), len(bookings)
+
+if __name__ == "__main__":
+    courts = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    start_date, end_date, rows = seed(db, courts, days)
+
+    get_occupancy_matrix(db, start_date, end_date)  # warm up
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = get_occupancy_matrix(db, start_date, end_date)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"Occupancy matrix: {rows:,} bookings, {courts} courts x {days} days "
+          f"-> {len(result['courts'])}x7x{len(result['hours'])} cells in {best * 1000:.1f} ms (best of {repeats})")
+    db.close()
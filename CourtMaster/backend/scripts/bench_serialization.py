@@ -0,0 +1,82 @@
+import sys
+import os
+import json
+import time
+from datetime import date, time as dtime, timedelta
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas
+from app.database import Base
+from app.responses import FastJSONResponse, rows_to_dicts
+
+# Micro-benchmark: GET /bookings/ serialization, ORM + Pydantic (old) vs column tuples + orjson (new).
+# Runs against a throwaway in-memory SQLite database.
+# Usage: python scripts/bench_serialization.py [ROWS] [REPEATS]
+
+def seed(db, rows):
+    courts = 10
+    db.add_all([models.Court(id=i, name=f"Court {i}", active=True) for i in range(1, courts + 1)])
+    bookings = []
+    day = date(2025, 1, 1)
+    for i in range(rows):
+        court = i % courts + 1
+        slot = (i // courts) % 16
+        if i and i % (courts * 16) == 0:
+            day += timedelta(days=1)
+        bookings.append({
+            "customer_name": f"Customer {i}",
+            "mobile": f"98765{i:05d}",
+            "date": day,
+            "court_id": court,
+            "start_time": dtime(6 + slot, 0),
+            "end_time": dtime(7 + slot, 0),
+            "status": "booked",
+            "category": "booking",
+        })
+    db.execute(models.Booking.__table__.insert(), bookings)
+    db.commit()
+
+def old_path(db, rows):
+    bookings = crud.get_bookings(db, limit=rows)
+    validated = TypeAdapter(List[schemas.Booking]).validate_python(bookings, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+def new_path(db, rows):
+    bookings = crud.get_booking_rows(db, limit=rows)
+    return FastJSONResponse(rows_to_dicts(bookings)).body
+
+def bench(label, fn, db, rows, repeats):
+    fn(db, rows)  # warm up
+    best = None
+    for _ in range(repeats):
+        db.expunge_all()
+        start = time.perf_counter()
+        body = fn(db, rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best * 1000:8.1f} ms  {rows / best:12,.0f} rows/s  ({len(body):,} bytes)")
+    return best
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, rows)
+
+    print(f"Serializing {rows:,} bookings (best of {repeats})")
+    old = bench("ORM + Pydantic + json", old_path, db, rows, repeats)
+    new = bench("column tuples + orjson", new_path, db, rows, repeats)
+    print(f"Speedup: {old / new:.1f}x")
+    db.close()
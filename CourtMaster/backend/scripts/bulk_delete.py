@@ -0,0 +1,60 @@
+import sys
+import os
+import argparse
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud
+from app.database import SessionLocal
+from app.services.exports import ARCHIVE_FORMATS, BookingArchive
+
+# Batched bulk delete of a week/month/year of bookings, same as POST /bookings/bulk-delete.
+# Usage: python scripts/bulk_delete.py yearly --year 2023 [--archive ndjson|parquet] [--out PATH]
+# (a parquet archive is a directory of part files, one per batch)
+#        python scripts/bulk_delete.py monthly --year 2024 --month 3 --batch-size 2000 --pause 0.1
+
+def bulk_delete(period, year=None, month=None, week=None, archive_format=None, out=None,
+                batch_size=crud.BULK_DELETE_BATCH, pause=crud.BULK_DELETE_PAUSE):
+    date_range = crud.bulk_delete_range(period, year=year, month=month, week=week)
+    if date_range is None:
+        print("Week out of range for month, nothing to delete.")
+        return 0
+    start_date, end_date = date_range
+    print(f"Deleting bookings {start_date} -> {end_date} in batches of {batch_size}...")
+
+    archive = None
+    if archive_format:
+        out = out or f"bookings_{start_date}_{end_date}.{ARCHIVE_FORMATS[archive_format]}"
+        archive = BookingArchive(out, archive_format)
+        print(f"Archiving deleted rows to {out}")
+
+    db = SessionLocal()
+    deleted = 0
+    try:
+        for deleted, total in crud.iter_bulk_delete(db, start_date, end_date, batch_size=batch_size,
+                                                    pause=pause, archive=archive):
+            print(f"  {deleted}/{total} ({100 * deleted / total:.0f}%)")
+    finally:
+        db.close()
+        if archive is not None:
+            archive.close()
+    print(f"Deleted {deleted} bookings.")
+    return deleted
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete bookings of a period in batches")
+    parser.add_argument("period", choices=["weekly", "monthly", "yearly"])
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--month", type=int)
+    parser.add_argument("--week", type=int)
+    parser.add_argument("--archive", choices=list(ARCHIVE_FORMATS), help="keep a copy of the deleted rows")
+    parser.add_argument("--out", help="archive path (a new directory for parquet)")
+    parser.add_argument("--batch-size", type=int, default=crud.BULK_DELETE_BATCH)
+    parser.add_argument("--pause", type=float, default=crud.BULK_DELETE_PAUSE, help="seconds between batches")
+    args = parser.parse_args()
+    try:
+        bulk_delete(args.period, args.year, args.month, args.week, args.archive, args.out,
+                    args.batch_size, args.pause)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,33 @@
+import sys
+import os
+from datetime import date
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services import partitions
+
+def ensure_partitions(today=None):
+    # Create the next BOOKING_PARTITIONS_AHEAD monthly booking partitions (Postgres, after
+    # the partitioning migration). Run it daily from cron, e.g.
+    #   15 3 * * * cd /srv/courtmaster/backend && python scripts/ensure_partitions.py
+    # Usage: python scripts/ensure_partitions.py [TODAY]   (YYYY-MM-DD)
+    db = SessionLocal()
+    try:
+        if not partitions.is_partitioned(db):
+            print("bookings is not partitioned, nothing to do.")
+            return 0
+        created, skipped = partitions.ensure_future_partitions(db, today)
+    finally:
+        db.close()
+    for month in created:
+        print(f"Created {partitions.partition_name(month)}")
+    for month in skipped:
+        print(f"Skipped {partitions.partition_name(month)}: lock timeout (retried next run) "
+              f"or rows already in {partitions.DEFAULT_PARTITION}")
+    return 1 if skipped else 0
+
+if __name__ == "__main__":
+    args = [date.fromisoformat(a) for a in sys.argv[1:2]]
+    sys.exit(ensure_partitions(*args))
@@ -0,0 +1,55 @@
+import sys
+import os
+import argparse
+import csv
+import time
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services import imports
+
+# Bulk import of bookings from a spreadsheet, same as POST /bookings/import.
+# Usage: python scripts/import_bookings.py bookings.xlsx [--mode best_effort] [--dry-run] [--errors errors.csv]
+#        python scripts/import_bookings.py export.txt --format csv
+
+def import_file(path, format=None, mode="all_or_nothing", dry_run=False, errors_path=None):
+    format = imports.import_format(path, format)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as f:
+            result = imports.import_bookings(db, f, format, mode=mode, dry_run=dry_run)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"{result['total_rows']} rows: {result['imported']} imported, {result['failed']} failed "
+          f"({elapsed:.1f}s{', dry run' if dry_run else ''})")
+    if errors_path:
+        with open(errors_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["row", "reason"])
+            writer.writeheader()
+            writer.writerows(result["errors"])
+        print(f"Error report written to {errors_path}")
+    else:
+        for error in result["errors"][:20]:
+            print(f"  row {error['row']}: {error['reason']}")
+        if result["failed"] > 20:
+            print(f"  ... {result['failed'] - 20} more (use --errors FILE for the full report)")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import bookings from an xlsx or CSV file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=list(imports.IMPORT_FORMATS), help="defaults to the file extension")
+    parser.add_argument("--mode", choices=["all_or_nothing", "best_effort"], default="all_or_nothing")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    parser.add_argument("--errors", help="write the per-row error report to this CSV file")
+    args = parser.parse_args()
+    try:
+        result = import_file(args.path, args.format, args.mode, args.dry_run, args.errors)
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(1 if result["failed"] else 0)
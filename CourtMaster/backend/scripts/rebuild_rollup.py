@@ -0,0 +1,24 @@
+import sys
+import os
+from datetime import date
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud
+from app.database import SessionLocal
+
+def rebuild_rollup(start_date=None, end_date=None):
+    # Backfill / repair booking_daily_rollup from the bookings table.
+    # Usage: python scripts/rebuild_rollup.py [START_DATE [END_DATE]]   (dates as YYYY-MM-DD)
+    print(f"Rebuilding booking_daily_rollup ({start_date or 'beginning'} -> {end_date or 'end'})...")
+    db = SessionLocal()
+    try:
+        rows = crud.rebuild_booking_rollup(db, start_date=start_date, end_date=end_date)
+        print(f"Rollup rebuilt: {rows} rows written.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    args = [date.fromisoformat(a) for a in sys.argv[1:3]]
+    rebuild_rollup(*args)
@@ -0,0 +1,77 @@
+import sys
+import os
+from datetime import date
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app import crud
+from app.database import SessionLocal, engine
+
+# Checks via EXPLAIN that the calendar, daily chart and years queries are index range scans.
+# Runs the real crud functions, captures the SQL they send, and EXPLAINs each statement.
+
+def capture_statements(fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+def explain(db, statement, parameters):
+    conn = db.connection()
+    if engine.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        return "\n".join(r[-1] for r in rows)
+    # Small tables make a seq scan cheapest; disable it so we see whether an index is usable at all
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+    return "\n".join(r[0] for r in rows)
+
+def uses_index(plan: str, table: str) -> bool:
+    if engine.dialect.name == "sqlite":
+        return any(
+            line.startswith("SEARCH " + table) and ("INDEX" in line or "PRIMARY KEY" in line)
+            for line in plan.splitlines()
+        )
+    return "Index" in plan and "Seq Scan" not in plan
+
+def verify_indexes():
+    print("Verifying index usage of date range queries...")
+    db = SessionLocal()
+    today = date.today()
+    checks = [
+        ("get_monthly_calendar", "booking_daily_rollup", lambda: crud.get_monthly_calendar(db, today.year, today.month)),
+        ("get_monthly_calendar(court_id)", "booking_daily_rollup", lambda: crud.get_monthly_calendar(db, today.year, today.month, court_id=1)),
+        ("get_daily_bookings_chart", "booking_daily_rollup", lambda: crud.get_daily_bookings_chart(db, days=30)),
+        ("get_booking_years", "bookings", lambda: crud.get_booking_years(db)),
+    ]
+    failures = 0
+    try:
+        for name, table, fn in checks:
+            statements = capture_statements(fn)
+            for statement, parameters in statements:
+                plan = explain(db, statement, parameters)
+                if uses_index(plan, table):
+                    print(f"✅ {name}: index used")
+                else:
+                    failures += 1
+                    print(f"❌ {name}: no index range scan on {table}\n{plan}")
+            db.rollback()
+    finally:
+        db.close()
+
+    if failures:
+        print(f"❌ FAILURE: {failures} queries do not use an index")
+        sys.exit(1)
+    print("✅ SUCCESS: all date range queries use an index")
+
+if __name__ == "__main__":
+    verify_indexes()
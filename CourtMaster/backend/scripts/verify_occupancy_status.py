@@ -0,0 +1,50 @@
+import sys
+import os
+from datetime import date, time
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models
+from app.database import Base
+from app.services.occupancy import get_occupancy_matrix
+
+# Check: the occupancy matrix counts the same bookings as the dashboard stats and the
+# revenue pivot (confirmed/booked only, any case), so the grids add up to the same revenue.
+# Runs against a throwaway in-memory SQLite database.
+# Usage: python scripts/verify_occupancy_status.py
+
+def verify():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        db.add(models.Settings(slot_duration=60, open_time=time(6, 0), close_time=time(22, 0), price_per_hour=400))
+        db.add(models.Court(id=1, name="Court 1", active=True))
+        day = date(2025, 3, 3)  # a Monday
+        for hour, status in [(10, "booked"), (11, "Confirmed"), (12, "cancelled"), (13, "pending")]:
+            db.add(models.Booking(customer_name=f"Customer {hour}", date=day, court_id=1,
+                                  start_time=time(hour, 0), end_time=time(hour + 1, 0),
+                                  status=status, category="booking"))
+        db.commit()
+
+        result = get_occupancy_matrix(db, day, day)
+        booked_minutes = sum(sum(row) for row in result["booked_minutes"][0])
+        revenue = sum(sum(row) for row in result["revenue"][0])
+        crud.rebuild_booking_rollup(db)
+        total = next(r for r in crud.get_revenue_pivot(db, day, day) if r["level"] == "total")
+        print(f"Occupancy: {booked_minutes} booked minutes, revenue {revenue}")
+        print(f"Revenue pivot: {total['hours']} hours, revenue {total['revenue']}")
+        assert booked_minutes == 120, "cancelled/pending bookings must not count as booked"
+        assert revenue == 800, "cancelled/pending bookings must not count as revenue"
+        assert revenue == total["revenue"] and booked_minutes == total["hours"] * 60
+        print("OK: only confirmed/booked bookings are counted.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    verify()
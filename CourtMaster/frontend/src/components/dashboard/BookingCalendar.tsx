@@ -93,8 +93,11 @@ export function BookingCalendar() {
             const startTimeString = selectedSlot.time; // "05:00"
             const startTimeDate = parse(startTimeString, "HH:mm", new Date());
 
-            // Calculate end time based on slot duration
-            const endTimeDate = addMinutes(startTimeDate, settings.slot_duration);
+            // Calculate end time based on slot duration, cut at closing time
+            // (a last slot running past midnight would otherwise end at "00:00")
+            const closeTimeDate = parse(settings.close_time, "HH:mm", startTimeDate);
+            const slotEndDate = addMinutes(startTimeDate, settings.slot_duration);
+            const endTimeDate = slotEndDate > closeTimeDate ? closeTimeDate : slotEndDate;
 
             const startParam = startTimeString + ":00";
             const endParam = format(endTimeDate, "HH:mm:ss");
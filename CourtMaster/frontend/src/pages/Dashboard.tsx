@@ -16,21 +16,20 @@ export function Dashboard() {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                // Fetch stats with selected period
-                const statsRes = await api.get("/reports/dashboard/stats", {
-                    params: { period: revenuePeriod }
-                });
-
-                // Fetch charts (only once or separate if needed, but for now keeping together loosely or separate)
-                // To avoid flickering, we can separate them. 
-                // But simplified:
-
                 if (!charts) {
-                    const chartsRes = await api.get("/reports/dashboard/charts");
-                    setCharts(chartsRes.data);
+                    // First load: stats and charts in one concurrent round trip
+                    const res = await api.get("/reports/dashboard", {
+                        params: { period: revenuePeriod }
+                    });
+                    setCharts(res.data.charts);
+                    setStats(res.data.stats);
+                } else {
+                    // Period change only affects the stats cards
+                    const statsRes = await api.get("/reports/dashboard/stats", {
+                        params: { period: revenuePeriod }
+                    });
+                    setStats(statsRes.data);
                 }
-
-                setStats(statsRes.data);
             } catch (error) {
                 console.error("Failed to fetch dashboard data", error);
             } finally {